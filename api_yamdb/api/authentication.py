@@ -0,0 +1,78 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.keys_by_user = {}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return copy.copy(user)
+
+    def set(self, key, user):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, copy.copy(user))
+            self.entries.move_to_end(key)
+            self.keys_by_user.setdefault(key[0], set()).add(key)
+            while len(self.entries) > self.max_size:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, user_id):
+        with self.lock:
+            for key in self.keys_by_user.get(user_id, set()).copy():
+                self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_user.clear()
+
+    def _remove(self, key):
+        self.entries.pop(key, None)
+        keys = self.keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_user[key[0]]
+
+
+user_cache = UserCache(
+    max_size=settings.AUTH_USER_CACHE['MAX_SIZE'],
+    ttl=settings.AUTH_USER_CACHE['TTL']
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        key = (
+            validated_token.get(api_settings.USER_ID_CLAIM),
+            validated_token.get(api_settings.JTI_CLAIM)
+        )
+        if key[0] is None:
+            return super().get_user(validated_token)
+        user = user_cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        return user
@@ -0,0 +1,91 @@
+from django.db import transaction
+
+from reviews.leaderboards import create_top_rated_entries
+from reviews.models import Category, Genre, Title
+from reviews.search import index_titles
+from .cache import bump_version
+from .serializers import TitleBulkSerializer
+from .utils import iter_batches
+
+
+def get_inserted_ids(titles):
+    if all(title.pk for title in titles):
+        return [title.pk for title in titles]
+    # SQLite не возвращает id из bulk_create, но транзакция держит
+    # блокировку на запись, поэтому последние id принадлежат этой вставке.
+    ids = Title.objects.order_by('-id').values_list('id', flat=True)
+    return sorted(ids[:len(titles)])
+
+
+def create_titles(items, batch_size):
+    created = []
+    errors = []
+    offset = 0
+    for batch in iter_batches(items, batch_size):
+        batch_created, batch_errors = create_batch(batch, offset)
+        created.extend(batch_created)
+        errors.extend(batch_errors)
+        offset += len(batch)
+    if created:
+        bump_version()
+    return created, errors
+
+
+def create_batch(batch, offset):
+    errors = []
+    valid = []
+    for index, item in enumerate(batch, start=offset):
+        if isinstance(item, Exception):
+            errors.append({'index': index, 'errors': [str(item)]})
+            continue
+        serializer = TitleBulkSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+
+    genres = dict(Genre.objects.filter(slug__in={
+        slug for _, data in valid for slug in data['genre']
+    }).values_list('slug', 'id'))
+    categories = dict(Category.objects.filter(slug__in={
+        data['category'] for _, data in valid
+    }).values_list('slug', 'id'))
+
+    resolved = []
+    for index, data in valid:
+        item_errors = {}
+        missing = [slug for slug in data['genre'] if slug not in genres]
+        if missing:
+            item_errors['genre'] = [f'Жанр \'{slug}\' не найден.'
+                                    for slug in missing]
+        if data['category'] not in categories:
+            item_errors['category'] = [
+                f'Категория \'{data["category"]}\' не найдена.'
+            ]
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        resolved.append((index, data))
+    if not resolved:
+        return [], errors
+
+    titles = [
+        Title(name=data['name'], year=data['year'],
+              description=data.get('description'),
+              category_id=categories[data['category']])
+        for _, data in resolved
+    ]
+    with transaction.atomic():
+        Title.objects.bulk_create(titles)
+        ids = get_inserted_ids(titles)
+        Title.genre.through.objects.bulk_create([
+            Title.genre.through(title_id=title_id, genre_id=genres[slug])
+            for title_id, (_, data) in zip(ids, resolved)
+            for slug in dict.fromkeys(data['genre'])
+        ])
+        for title, title_id in zip(titles, ids):
+            title.pk = title_id
+        index_titles(titles)
+        create_top_rated_entries(ids)
+    return [{'index': index, 'id': title_id}
+            for title_id, (index, _) in zip(ids, resolved)], errors
@@ -0,0 +1,38 @@
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import urlencode
+
+VERSION_KEY = 'catalogue:version'
+
+
+def get_cache():
+    return caches[settings.CATALOGUE_CACHE['ALIAS']]
+
+
+def get_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, (uuid.uuid4().hex, int(time.time())), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    get_cache().set(VERSION_KEY, (uuid.uuid4().hex, int(time.time())), None)
+
+
+def make_key(request, version):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'catalogue:{version}:{digest}'
+
+
+def make_etag(data):
+    content = json.dumps(data, sort_keys=True, default=str)
+    return '"{}"'.format(hashlib.md5(content.encode()).hexdigest())
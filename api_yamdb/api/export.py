@@ -0,0 +1,54 @@
+import csv
+import json
+from collections import defaultdict
+
+from reviews.models import Title
+from .utils import iter_batches
+
+FIELDS = ('id', 'name', 'year', 'description', 'category', 'genre',
+          'rating', 'review_count')
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+def iter_titles(chunk_size):
+    titles = Title.objects.order_by('id').values(
+        'id', 'name', 'year', 'description', 'category__slug',
+        'rating', 'review_count'
+    ).iterator(chunk_size=chunk_size)
+    for chunk in iter_batches(titles, chunk_size):
+        genres = defaultdict(list)
+        links = Title.genre.through.objects.filter(
+            title_id__in=[title['id'] for title in chunk]
+        ).order_by('title_id', 'genre__slug').values_list(
+            'title_id', 'genre__slug'
+        )
+        for title_id, slug in links:
+            genres[title_id].append(slug)
+        for title in chunk:
+            title['category'] = title.pop('category__slug')
+            title['genre'] = genres[title['id']]
+            yield title
+
+
+def iter_ndjson(chunk_size):
+    for title in iter_titles(chunk_size):
+        yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+def iter_csv(chunk_size):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIELDS)
+    for title in iter_titles(chunk_size):
+        title['genre'] = ','.join(title['genre'])
+        yield writer.writerow([title[field] for field in FIELDS])
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
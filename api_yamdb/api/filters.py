@@ -1,6 +1,7 @@
 from django_filters import rest_framework as filters
 
 from reviews.models import Category, Genre, Title
+from reviews.search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
@@ -17,7 +18,11 @@ class TitleFilter(filters.FilterSet):
     name = filters.CharFilter(
         field_name='name', lookup_expr='icontains'
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'year', 'name')
+        fields = ('category', 'genre', 'year', 'name', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
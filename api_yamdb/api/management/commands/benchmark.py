@@ -0,0 +1,261 @@
+import json
+import logging
+import platform
+import random
+import subprocess
+import time
+from argparse import ArgumentTypeError
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (CaptureQueriesContext, setup_test_environment,
+                               teardown_test_environment)
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.cache import bump_version
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.counters import recalculate_comments_count
+from reviews.leaderboards import refresh_top_rated, refresh_trending
+from reviews.ratings import rebuild_histograms, recalculate_ratings
+from reviews.search import rebuild_index
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise ArgumentTypeError('значение должно быть больше нуля')
+    return value
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1,
+                       round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест API v1 на синтетических данных '
+            'во временной тестовой базе.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--titles', type=int, default=500)
+        parser.add_argument('--reviews-per-title', type=int, default=20)
+        parser.add_argument('--comments-per-review', type=int, default=2)
+        parser.add_argument('--requests', type=positive_int, default=100,
+                            help='Количество запросов к каждому адресу.')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Сбрасывать кэш каталога перед запросом.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='benchmark.json')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            started = time.perf_counter()
+            admin = self.seed(options)
+            self.stdout.write(
+                f'Данные созданы за {time.perf_counter() - started:.1f} с'
+            )
+            results = self.run_endpoints(admin, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        report = {
+            'meta': {
+                'commit': self.get_commit(),
+                'created': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'dataset': {key: options[key] for key in (
+                    'users', 'titles', 'reviews_per_title',
+                    'comments_per_review', 'requests', 'cold_cache', 'seed'
+                )},
+            },
+            'endpoints': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
+
+    def seed(self, options):
+        admin = User.objects.create_user(
+            username='bench_admin', email='bench_admin@yamdb.fake',
+            role=User.ADMIN
+        )
+        User.objects.bulk_create(
+            [User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+             for i in range(options['users'])],
+            batch_size=BATCH_SIZE
+        )
+        user_ids = list(User.objects.exclude(pk=admin.pk).values_list(
+            'pk', flat=True
+        )) or [admin.pk]
+        Category.objects.bulk_create(
+            [Category(name=f'Категория {i}', slug=f'category-{i}')
+             for i in range(10)]
+        )
+        Genre.objects.bulk_create(
+            [Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(20)]
+        )
+        category_ids = list(Category.objects.values_list('pk', flat=True))
+        genre_ids = list(Genre.objects.values_list('pk', flat=True))
+        Title.objects.bulk_create(
+            [Title(name=f'Произведение {i}', year=1950 + i % 70,
+                   description=f'Описание произведения номер {i}',
+                   category_id=random.choice(category_ids))
+             for i in range(options['titles'])],
+            batch_size=BATCH_SIZE
+        )
+        title_ids = list(Title.objects.values_list('pk', flat=True))
+        Title.genre.through.objects.bulk_create(
+            [Title.genre.through(title_id=title_id, genre_id=genre_id)
+             for title_id in title_ids
+             for genre_id in random.sample(genre_ids, 2)],
+            batch_size=BATCH_SIZE
+        )
+        reviews_per_title = min(options['reviews_per_title'], len(user_ids))
+        for title_id in title_ids:
+            Review.objects.bulk_create(
+                [Review(title_id=title_id, author_id=author_id,
+                        text=f'Отзыв на произведение {title_id}',
+                        score=random.randint(1, 10))
+                 for author_id in random.sample(user_ids, reviews_per_title)]
+            )
+        comments = []
+        review_ids = Review.objects.values_list(
+            'pk', flat=True
+        ).iterator()
+        for review_id in review_ids:
+            comments.extend(
+                Comment(review_id=review_id, author_id=random.choice(user_ids),
+                        text=f'Комментарий к отзыву {review_id}')
+                for _ in range(options['comments_per_review'])
+            )
+            if len(comments) >= BATCH_SIZE:
+                Comment.objects.bulk_create(comments)
+                comments = []
+        Comment.objects.bulk_create(comments)
+        recalculate_ratings()
+        rebuild_histograms()
+        refresh_top_rated()
+        refresh_trending()
+        recalculate_comments_count()
+        rebuild_index()
+        bump_version()
+        return admin
+
+    def get_endpoints(self):
+        title = Title.objects.filter(review_count__gt=0).order_by('pk').first()
+        title = title or Title.objects.order_by('pk').first()
+        review = Review.objects.filter(title=title).order_by('pk').first()
+        category = Category.objects.order_by('pk').first()
+        genre = Genre.objects.order_by('pk').first()
+        endpoints = {
+            'categories-list': ('/api/v1/categories/', False),
+            'genres-list': ('/api/v1/genres/', False),
+            'titles-list': ('/api/v1/titles/', False),
+            'titles-list-deep-page': ('/api/v1/titles/?page=20', False),
+            'titles-filter': (f'/api/v1/titles/?genre={genre.slug}'
+                              f'&category={category.slug}', False),
+            'titles-search': ('/api/v1/titles/?search=произв', False),
+            'titles-top': (f'/api/v1/titles/top/?genre={genre.slug}', False),
+            'titles-trending': ('/api/v1/titles/trending/', False),
+            'users-list': ('/api/v1/users/', True),
+            'users-me': ('/api/v1/users/me/', True),
+        }
+        if title is not None:
+            endpoints.update({
+                'titles-detail': (f'/api/v1/titles/{title.pk}/', False),
+                'titles-stats': (f'/api/v1/titles/{title.pk}/stats/', False),
+                'reviews-list': (f'/api/v1/titles/{title.pk}/reviews/', False),
+                'reviews-cursor': (f'/api/v1/titles/{title.pk}/reviews/'
+                                   '?pagination=cursor', False),
+            })
+        if review is not None:
+            endpoints.update({
+                'reviews-detail': (f'/api/v1/titles/{title.pk}/reviews/'
+                                   f'{review.pk}/', False),
+                'comments-list': (f'/api/v1/titles/{title.pk}/reviews/'
+                                  f'{review.pk}/comments/', False),
+            })
+        return endpoints
+
+    def run_endpoints(self, admin, options):
+        # Журнал запросов пишет строку на каждый запрос: это засоряет вывод
+        # и добавляет к замерам время на логирование.
+        query_logger = logging.getLogger('api.queries')
+        level = query_logger.level
+        query_logger.setLevel(logging.WARNING)
+        try:
+            return self.time_endpoints(admin, options)
+        finally:
+            query_logger.setLevel(level)
+
+    def time_endpoints(self, admin, options):
+        anonymous = Client()
+        authorized = Client(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}'
+        )
+        results = {}
+        for name, (url, auth) in self.get_endpoints().items():
+            client = authorized if auth else anonymous
+            client.get(url)
+            timings = []
+            queries = []
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                if options['cold_cache']:
+                    bump_version()
+                with CaptureQueriesContext(connection) as context:
+                    request_started = time.perf_counter()
+                    response = client.get(url)
+                    timings.append(
+                        (time.perf_counter() - request_started) * 1000
+                    )
+                queries.append(len(context.captured_queries))
+                if response.status_code != 200:
+                    self.stderr.write(f'{name}: статус {response.status_code}')
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                'url': url,
+                'p50_ms': round(percentile(timings, 50), 3),
+                'p95_ms': round(percentile(timings, 95), 3),
+                'p99_ms': round(percentile(timings, 99), 3),
+                'queries_per_request': round(sum(queries) / len(queries), 2),
+                'max_queries': max(queries),
+                'requests_per_second': round(len(timings) / elapsed, 1),
+            }
+            self.stdout.write(
+                f'{name:24} p50 {results[name]["p50_ms"]:8.2f} мс  '
+                f'p95 {results[name]["p95_ms"]:8.2f} мс  '
+                f'p99 {results[name]["p99_ms"]:8.2f} мс  '
+                f'{results[name]["queries_per_request"]:5} запр.  '
+                f'{results[name]["requests_per_second"]:8.1f} rps'
+            )
+        return results
+
+    def get_commit(self):
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                universal_newlines=True
+            ).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,93 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api.queries')
+
+IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+SPACES = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    sql = IN_LIST.sub('IN (...)', sql)
+    sql = LITERAL.sub('?', sql)
+    return SPACES.sub(' ', sql).strip()
+
+
+class QueryStats:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - started)
+
+    def record(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        if self.slowest_sql is None or duration > self.slowest_duration:
+            self.slowest_sql = sql
+            self.slowest_duration = duration
+        self.fingerprints[fingerprint(sql)] += 1
+
+    def get_duplicates(self):
+        return {sql: count for sql, count in self.fingerprints.items()
+                if count > 1}
+
+    def has_n_plus_one(self, threshold):
+        return any(count >= threshold
+                   for count in self.fingerprints.values())
+
+
+class QueryInstrumentationMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = settings.QUERY_INSTRUMENTATION['N_PLUS_ONE_THRESHOLD']
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = (time.perf_counter() - started) * 1000
+        response['Server-Timing'] = (
+            f'db;dur={stats.duration * 1000:.1f};'
+            f'desc="{stats.count} queries", '
+            f'total;dur={total:.1f}'
+        )
+        n_plus_one = stats.has_n_plus_one(self.threshold)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(total, 2),
+            'queries': stats.count,
+            'db_ms': round(stats.duration * 1000, 2),
+            'slowest_query_ms': round(stats.slowest_duration * 1000, 2),
+            'slowest_query': stats.slowest_sql,
+            'duplicates': stats.get_duplicates(),
+            'n_plus_one': n_plus_one,
+        }
+        logger.log(
+            logging.WARNING if n_plus_one else logging.INFO,
+            json.dumps(record, ensure_ascii=False)
+        )
+        return response
@@ -1,4 +1,13 @@
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import mixins, viewsets
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from reviews.models import Review, Title
+from . import cache
+from .utils import get_list_param
 
 
 class ListCreateDestroyViewSet(
@@ -6,3 +15,61 @@ class ListCreateDestroyViewSet(
     mixins.DestroyModelMixin, viewsets.GenericViewSet
 ):
     pass
+
+
+class CachedListMixin:
+
+    def list(self, request, *args, **kwargs):
+        version, last_modified = cache.get_version()
+        key = cache.make_key(request, version)
+        cached = cache.get_cache().get(key)
+        if cached is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cached = (response.data, cache.make_etag(response.data))
+            cache.get_cache().set(
+                key, cached, settings.CATALOGUE_CACHE['TIMEOUT']
+            )
+        data, etag = cached
+        response = Response(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+            response=response
+        )
+
+
+class ExpandMixin:
+    expand_query_param = 'expand'
+
+    def get_expand(self):
+        return get_list_param(self.request, self.expand_query_param)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+
+class TitleParentMixin:
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
+
+
+class ReviewParentMixin:
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id')
+            )
+        return self._review
@@ -1,5 +1,281 @@
-from rest_framework.pagination import PageNumberPagination
+from collections import OrderedDict
+from functools import partial
 
+from django.conf import settings
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       LimitOffsetPagination,
+                                       PageNumberPagination, _positive_int,
+                                       _reverse_ordering)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
-class UserPagination(PageNumberPagination):
+
+class KnownCountPaginator(DjangoPaginator):
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+class KnownCountLimitOffsetPagination(LimitOffsetPagination):
+    known_count = None
+
+    def get_count(self, queryset):
+        if self.known_count is not None:
+            return self.known_count
+        return super().get_count(queryset)
+
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ApiPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = settings.PAGINATION_MAX_PAGE_SIZE
+    limit_query_param = 'limit'
+    offset_query_param = 'offset'
+    count_query_param = 'count'
+    count_by_default = True
+    # Выше этого порога COUNT(*) заменяется оценкой, None - всегда точно.
+    estimate_count_above = None
+
+    def __init__(self):
+        self.delegate = None
+        self.probed = False
+        self.count = None
+        self.count_estimated = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.delegate = None
+        self.probed = False
+        self.count = None
+        self.count_estimated = False
+        with_count = request.query_params.get(self.count_query_param)
+        if with_count is None:
+            with_count = self.count_by_default
+        else:
+            with_count = with_count.lower() not in ('false', '0', 'no')
+        params = request.query_params
+        limit_offset = (self.limit_query_param in params
+                        or self.offset_query_param in params)
+        if with_count and self.estimate_count_above is not None:
+            self.count = self.get_count(queryset, view)
+        if with_count and not self.count_estimated:
+            # Точное количество - обычный формат DRF без повторного COUNT.
+            if limit_offset:
+                self.delegate = self.get_limit_offset_paginator()
+                self.delegate.known_count = self.count
+                return self.delegate.paginate_queryset(queryset, request, view)
+            self.django_paginator_class = partial(
+                KnownCountPaginator, count=self.count
+            )
+            return super().paginate_queryset(queryset, request, view)
+        if limit_offset:
+            paginator = self.get_limit_offset_paginator()
+            limit = paginator.get_limit(request)
+            offset = paginator.get_offset(request)
+            return self.paginate_by_probe(
+                queryset, offset, limit, self.offset_query_param, offset
+            )
+        page_size = self.get_page_size(request)
+        page = self.get_page_number_without_count(request)
+        return self.paginate_by_probe(
+            queryset, (page - 1) * page_size, page_size,
+            self.page_query_param, page
+        )
+
+    def get_count(self, queryset, view):
+        threshold = self.estimate_count_above
+        count = queryset.order_by()[:threshold + 1].count()
+        if count <= threshold:
+            return count
+        get_estimate = getattr(view, 'get_count_estimate', None)
+        estimate = get_estimate(queryset) if get_estimate else None
+        if estimate is None:
+            estimate = estimate_count(queryset)
+        if estimate is None:
+            return queryset.count()
+        self.count_estimated = True
+        return max(estimate, count)
+
+    def get_limit_offset_paginator(self):
+        paginator = KnownCountLimitOffsetPagination()
+        paginator.default_limit = self.page_size
+        paginator.max_limit = self.max_page_size
+        paginator.limit_query_param = self.limit_query_param
+        paginator.offset_query_param = self.offset_query_param
+        return paginator
+
+    def get_page_number_without_count(self, request):
+        try:
+            return _positive_int(
+                request.query_params.get(self.page_query_param, 1), strict=True
+            )
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Invalid page.'
+            ))
+
+    def paginate_by_probe(self, queryset, offset, limit, param, position):
+        rows = list(queryset[offset:offset + limit + 1])
+        url = self.request.build_absolute_uri()
+        step = 1 if param == self.page_query_param else limit
+        first = 1 if param == self.page_query_param else 0
+        self.probed = True
+        self.next_link = None
+        self.previous_link = None
+        if len(rows) > limit:
+            self.next_link = replace_query_param(url, param, position + step)
+        if position > first:
+            previous = max(position - step, first)
+            self.previous_link = (
+                remove_query_param(url, param) if previous == first
+                else replace_query_param(url, param, previous)
+            )
+        if not rows and param == self.page_query_param and position > first:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=position,
+                message='That page contains no results'
+            ))
+        self.display_page_controls = False
+        return rows[:limit]
+
+    def get_paginated_response(self, data):
+        if self.delegate is not None:
+            return self.delegate.get_paginated_response(data)
+        if not self.probed:
+            return super().get_paginated_response(data)
+        fields = [
+            ('next', self.next_link),
+            ('previous', self.previous_link),
+            ('results', data)
+        ]
+        if self.count is not None:
+            fields[:0] = [
+                ('count', self.count),
+                ('count_estimated', self.count_estimated)
+            ]
+        return Response(OrderedDict(fields))
+
+    def to_html(self):
+        if self.delegate is not None:
+            return self.delegate.to_html()
+        return super().to_html()
+
+
+class UserPagination(ApiPagination):
     page_size = 5
+
+
+class LeaderboardPagination(ApiPagination):
+    page_size = settings.LEADERBOARDS['PAGE_SIZE']
+    count_by_default = False
+
+
+class PubDateCursorPagination(CursorPagination):
+    # CursorPagination фильтрует только по первому полю сортировки и
+    # пропускает одинаковые даты через OFFSET. Здесь позиция - пара
+    # (pub_date, id), и каждая страница выбирается условием по индексу.
+    ordering = ('pub_date', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = settings.PAGINATION_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.display_page_controls = False
+        return self.page
+
+    def get_keyset_filter(self, position, reverse):
+        pub_date, _, pk = position.rpartition('_')
+        pub_date = parse_datetime(pub_date)
+        if pub_date is None or not pk.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        lookup = 'lt' if reverse else 'gt'
+        return (Q(**{f'pub_date__{lookup}': pub_date})
+                | Q(pub_date=pub_date, **{f'id__{lookup}': int(pk)}))
+
+    def _get_position_from_instance(self, instance, ordering):
+        return f'{instance.pub_date.isoformat()}_{instance.pk}'
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position)
+        )
+
+
+class CursorOptionalPagination(ApiPagination):
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+    estimate_count_above = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+
+    def use_cursor(self, request):
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.delegate = self.cursor_pagination_class()
+            self.delegate.page_size = self.page_size
+            return self.delegate.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
@@ -24,8 +24,10 @@ class ReadOnlyPermissionOrIsAdmin(permissions.BasePermission):
 
 class IsAuthorOrAdminOrModeratorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return (
-            obj.author == request.user
-            or request.method in permissions.SAFE_METHODS
-            or request.user.is_authenticated and request.user.is_moderator
-            or request.user.is_authenticated and request.user.is_admin)
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        user = request.user
+        return user.is_authenticated and (
+            obj.author_id == user.pk
+            or user.has_role(user.MODERATOR, user.ADMIN)
+        )
@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Comment, Genre, Review, Title
 
@@ -16,20 +19,43 @@ class SignupSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 'Использовать имя \'me\' в качестве username запрещено.'
             )
+        self.instance = self.get_existing_user(data)
+        return data
 
-        email = data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError(
-                f'Пользователь с email \'{email}\' уже существует.'
-            )
-
+    def get_existing_user(self, data):
         username = data.get('username')
-        if User.objects.filter(username=username).exists():
-            raise serializers.ValidationError(
-                f'Пользователь \'{username}\' уже существует.'
-            )
-
-        return data
+        email = data.get('email')
+        users = User.objects.filter(Q(email=email) | Q(username=username))
+        users = list(users[:2])
+        for user in users:
+            if user.email == email and user.username == username:
+                return user
+        if any(user.email == email for user in users):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Пользователь с email \'{email}\' уже существует.'
+                ]
+            })
+        if users:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Пользователь \'{username}\' уже существует.'
+                ]
+            })
+        return None
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            user = self.get_existing_user(validated_data)
+            if user is None:
+                raise
+            return user
+
+    def update(self, instance, validated_data):
+        return instance
 
 
 class TokenSerializer(serializers.Serializer):
@@ -62,13 +88,23 @@ class TitleReadSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
     rating = serializers.IntegerField(read_only=True)
+    reviews_count = serializers.IntegerField(
+        source='review_count', read_only=True
+    )
 
     class Meta:
         model = Title
-        fields = ('id', 'name', 'year', 'rating',
+        fields = ('id', 'name', 'year', 'rating', 'reviews_count',
                   'description', 'genre', 'category')
 
 
+class TrendingTitleSerializer(TitleReadSerializer):
+    recent_reviews = serializers.IntegerField(read_only=True)
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('recent_reviews',)
+
+
 class TitleWriteSerializer(TitleReadSerializer):
     genre = serializers.SlugRelatedField(
         many=True,
@@ -83,7 +119,7 @@ class TitleWriteSerializer(TitleReadSerializer):
 
     class Meta:
         model = Title
-        fields = ('id', 'name', 'year', 'rating',
+        fields = ('id', 'name', 'year', 'rating', 'reviews_count',
                   'description', 'genre', 'category')
 
     def validate_year(self, value):
@@ -93,16 +129,36 @@ class TitleWriteSerializer(TitleReadSerializer):
         return value
 
 
+class TitleBulkSerializer(TitleWriteSerializer):
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('username', 'role')
+
+
+class AuthorField(serializers.SlugRelatedField):
+
+    def __init__(self, **kwargs):
+        super().__init__(read_only=True, slug_field='username', **kwargs)
+
+    def to_representation(self, obj):
+        if 'author' in self.context.get('expand', ()):
+            return AuthorSerializer(obj).data
+        return super().to_representation(obj)
+
+
 class ReviewSerializer(serializers.ModelSerializer):
-    author = serializers.SlugRelatedField(
-        read_only=True,
-        slug_field='username'
-    )
+    author = AuthorField()
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
-        read_only_fields = ('title',)
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comments_count')
+        read_only_fields = ('title', 'comments_count')
         extra_kwargs = {'score': {'required': True}}
 
     def validate_score(self, value):
@@ -112,24 +168,34 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def validate(self, data):
-        title_id = self.context.get('kwargs').get('title_id')
-        user = self.context.get('request').user
-        if self.context.get('request').method == 'POST':
-            if Review.objects.filter(author=user, title_id=title_id).exists():
-                raise serializers.ValidationError(
-                    'К произведению можно добавить только один отзыв.'
-                )
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
-    author = serializers.SlugRelatedField(
-        read_only=True,
-        slug_field='username'
-    )
+    author = AuthorField()
 
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
         read_only_fields = ('review',)
+
+
+class ReviewWithCommentsSerializer(ReviewSerializer):
+    comments = CommentSerializer(source='latest_comments', many=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('comments',)
+
+
+class TitleWithReviewsSerializer(TitleReadSerializer):
+    reviews = ReviewSerializer(source='latest_reviews', many=True)
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('reviews',)
+
+
+class TitleWithCommentsSerializer(TitleReadSerializer):
+    reviews = ReviewWithCommentsSerializer(
+        source='latest_reviews', many=True
+    )
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('reviews',)
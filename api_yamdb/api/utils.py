@@ -0,0 +1,25 @@
+from itertools import islice
+
+from django.db.models import OuterRef, Subquery
+
+
+def iter_batches(items, batch_size):
+    items = iter(items)
+    batch = list(islice(items, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(items, batch_size))
+
+
+def get_list_param(request, name):
+    value = request.query_params.get(name, '')
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def limit_per_parent(queryset, parent_field, limit, ordering):
+    # Коррелированный подзапрос оставляет у каждого родителя только
+    # limit первых записей, поэтому prefetch остается одним запросом.
+    latest = queryset.model.objects.filter(
+        **{parent_field: OuterRef(parent_field)}
+    ).order_by(*ordering).values('pk')[:limit]
+    return queryset.filter(pk__in=Subquery(latest)).order_by(*ordering)
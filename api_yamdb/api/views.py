@@ -1,29 +1,44 @@
+from types import GeneratorType
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters import rest_framework as dfrf_filters
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, serializers, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title
+from mailing.queue import enqueue_mail
+from reviews import counters, leaderboards, ratings
+from reviews.models import Category, Comment, Genre, Review, Title
+from .bulk import create_titles
+from .export import EXPORT_FORMATS
 from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewSet
-from .pagination import UserPagination
+from .mixins import (CachedListMixin, ExpandMixin, ListCreateDestroyViewSet,
+                     ReviewParentMixin, TitleParentMixin)
+from .pagination import (CursorOptionalPagination, LeaderboardPagination,
+                         UserPagination)
+from .parsers import NDJSONParser
 from .permissions import (IsAdminPermission,
                           IsAuthorOrAdminOrModeratorOrReadOnly,
                           ReadOnlyPermissionOrIsAdmin)
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, ReviewSerializer, SignupSerializer,
-                          TitleReadSerializer, TitleWriteSerializer,
-                          TokenSerializer, UserSerializer)
+                          TitleReadSerializer, TitleWithCommentsSerializer,
+                          TitleWithReviewsSerializer, TitleWriteSerializer,
+                          TokenSerializer, TrendingTitleSerializer,
+                          UserSerializer)
+from .utils import get_list_param, limit_per_parent
 
 User = get_user_model()
 
@@ -35,15 +50,9 @@ def signup(request):
     serializer.is_valid(raise_exception=True)
     username = serializer.validated_data['username']
     email = serializer.validated_data['email']
-    user, _ = User.objects.get_or_create(email=email, username=username)
+    user = serializer.save()
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
-        '',
-        confirmation_code,
-        settings.EMAIL_ADMIN,
-        [email],
-        fail_silently=False
-    )
+    enqueue_mail('', confirmation_code, settings.EMAIL_ADMIN, [email])
     response = {
         'email': email,
         'username': username
@@ -91,7 +100,7 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(CachedListMixin, ListCreateDestroyViewSet):
     queryset = Category.objects.get_queryset().order_by('id')
     serializer_class = CategorySerializer
     filter_backends = (filters.SearchFilter,)
@@ -100,7 +109,7 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(CachedListMixin, ListCreateDestroyViewSet):
     queryset = Genre.objects.get_queryset().order_by('id')
     serializer_class = GenreSerializer
     filter_backends = (filters.SearchFilter,)
@@ -109,46 +118,194 @@ class GenreViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.get_queryset().order_by('id').annotate(
-        rating=Avg('reviews__score')
-    )
+class TitleViewSet(ExpandMixin, CachedListMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('id')
     permission_classes = (ReadOnlyPermissionOrIsAdmin,)
     filter_backends = (dfrf_filters.DjangoFilterBackend,)
     filterset_class = TitleFilter
+    include_query_param = 'include'
+
+    def get_include(self):
+        if self.action != 'retrieve':
+            return set()
+        return get_list_param(self.request, self.include_query_param)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        include = self.get_include()
+        ordering = ('-pub_date', '-id')
+        if include & {'reviews', 'comments'}:
+            reviews = limit_per_parent(
+                Review.objects.select_related('author'), 'title',
+                settings.TITLE_INCLUDE['REVIEWS'], ordering
+            )
+            queryset = queryset.prefetch_related(
+                Prefetch('reviews', queryset=reviews, to_attr='latest_reviews')
+            )
+        if 'comments' in include:
+            comments = limit_per_parent(
+                Comment.objects.select_related('author'), 'review',
+                settings.TITLE_INCLUDE['COMMENTS'], ordering
+            )
+            queryset = queryset.prefetch_related(
+                Prefetch('latest_reviews__comments', queryset=comments,
+                         to_attr='latest_comments')
+            )
+        return queryset
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
+            include = self.get_include()
+            if 'comments' in include:
+                return TitleWithCommentsSerializer
+            if 'reviews' in include:
+                return TitleWithReviewsSerializer
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(methods=['POST'], detail=False, url_path='bulk',
+            parser_classes=(JSONParser, NDJSONParser))
+    def bulk(self, request):
+        if not isinstance(request.data, (list, GeneratorType)):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается список произведений или NDJSON.'
+                ]
+            })
+        created, errors = create_titles(
+            request.data, settings.TITLES_BULK_BATCH_SIZE
+        )
+        return Response(
+            {'created': created, 'errors': errors},
+            status=status.HTTP_201_CREATED if created
+            else status.HTTP_400_BAD_REQUEST
+        )
+
+    def get_leaderboard_response(self, entries, serializer_class):
+        page = self.paginate_queryset(entries.select_related(
+            'title__category'
+        ).prefetch_related('title__genre'))
+        titles = []
+        for entry in page:
+            entry.title.recent_reviews = getattr(entry, 'recent_reviews', None)
+            titles.append(entry.title)
+        serializer = serializer_class(titles, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=['GET'], detail=False, url_path='top',
+            pagination_class=LeaderboardPagination)
+    def top(self, request):
+        min_reviews = request.query_params.get(
+            'min_reviews', settings.LEADERBOARDS['MIN_REVIEWS']
+        )
+        try:
+            min_reviews = int(min_reviews)
+        except (TypeError, ValueError):
+            min_reviews = -1
+        if min_reviews < 0:
+            raise serializers.ValidationError({
+                'min_reviews': ['Ожидается неотрицательное целое число.']
+            })
+        entries = leaderboards.get_top_rated(
+            category=request.query_params.get('category'),
+            genre=request.query_params.get('genre'),
+            min_reviews=min_reviews
+        )
+        return self.get_leaderboard_response(entries, TitleReadSerializer)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(methods=['GET'], detail=False, url_path='trending',
+            pagination_class=LeaderboardPagination)
+    def trending(self, request):
+        return self.get_leaderboard_response(
+            leaderboards.get_trending(), TrendingTitleSerializer
+        )
+
+    @action(methods=['GET'], detail=True, url_path='stats')
+    def stats(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.only('id', 'rating', 'review_count'), pk=pk
+        )
+        histogram = ratings.get_histogram(title)
+        return Response({
+            'id': title.pk,
+            'reviews_count': title.review_count,
+            'rating': title.rating,
+            'median': ratings.get_median(histogram),
+            'histogram': histogram,
+        })
+
+    @action(methods=['GET'], detail=False, url_path='export',
+            permission_classes=[IsAdminPermission])
+    def export(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise serializers.ValidationError({
+                'output': [f'Допустимые значения: '
+                           f'{", ".join(EXPORT_FORMATS)}.']
+            })
+        rows, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            rows(settings.TITLES_EXPORT_CHUNK_SIZE),
+            content_type=f'{content_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{output}"'
+        )
+        return response
+
+
+class ReviewViewSet(ExpandMixin, TitleParentMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorOrAdminOrModeratorOrReadOnly,
                           IsAuthenticatedOrReadOnly)
+    pagination_class = CursorOptionalPagination
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return Review.objects.filter(
+            title=self.get_title()
+        ).select_related('author')
 
-    def get_serializer_context(self):
-        return {'request': self.request, 'kwargs': self.kwargs}
+    def get_count_estimate(self, queryset):
+        return self.get_title().review_count
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        try:
+            with transaction.atomic():
+                review = serializer.save(author=self.request.user,
+                                         title=self.get_title())
+                ratings.review_created(review)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'К произведению можно добавить только один отзыв.'
+                ]
+            })
+
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        with transaction.atomic():
+            review = serializer.save()
+            ratings.review_updated(review, old_score)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ExpandMixin, ReviewParentMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrAdminOrModeratorOrReadOnly,
                           IsAuthenticatedOrReadOnly)
+    pagination_class = CursorOptionalPagination
 
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return Comment.objects.filter(
+            review=self.get_review()
+        ).select_related('author')
+
+    def get_count_estimate(self, queryset):
+        return self.get_review().comments_count
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        with transaction.atomic():
+            comment = serializer.save(author=self.request.user,
+                                      review=self.get_review())
+            counters.comment_created(comment)
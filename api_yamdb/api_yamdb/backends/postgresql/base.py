@@ -0,0 +1,31 @@
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return (self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+                and self.settings_dict['CONN_MAX_AGE'] != 0)
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        # Постоянное соединение проверяется один раз за запрос, перед
+        # первым обращением: за время простоя его мог закрыть сервер.
+        if (self.connection is not None and not self.health_check_done
+                and self.health_check_enabled and not self.in_atomic_block):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+        super().ensure_connection()
@@ -0,0 +1,115 @@
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import creation
+from psycopg2 import Error, pool
+
+from ..postgresql import base
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(pool.ThreadedConnectionPool):
+    # ThreadedConnectionPool сразу падает, когда соединения закончились;
+    # здесь поток ждет освобождения соединения не дольше timeout секунд.
+
+    def __init__(self, minconn, maxconn, timeout, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise pool.PoolError(
+                f'Нет свободных соединений в пуле за {self.timeout} с.'
+            )
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self.slots.release()
+
+
+def get_pool(settings_dict, conn_params):
+    key = tuple(sorted(conn_params.items()))
+    options = settings_dict.get('POOL', {})
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = BlockingConnectionPool(
+                options.get('MIN_SIZE', 1),
+                options.get('MAX_SIZE', 10),
+                options.get('TIMEOUT', 30),
+                **conn_params
+            )
+        return _pools[key]
+
+
+def close_pools():
+    with _pools_lock:
+        for connections in _pools.values():
+            connections.closeall()
+        _pools.clear()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Соединения, оставшиеся в пуле, не дадут удалить тестовую базу.
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                'Для пула соединений CONN_MAX_AGE должен быть равен 0: '
+                'соединение возвращается в пул в конце каждого запроса.'
+            )
+        self.pool = None
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.settings_dict, conn_params)
+        connection = self.pool.getconn()
+        # Соединение могло пролежать в пуле дольше, чем его держит сервер.
+        if not self.is_connection_usable(connection):
+            self.pool.putconn(connection, close=True)
+            connection = self.pool.getconn()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def is_connection_usable(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Error:
+            return False
+        if not connection.autocommit:
+            connection.rollback()
+        return True
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.pool.closed:
+                self.connection.close()
+            else:
+                self.pool.putconn(
+                    self.connection, close=bool(self.connection.closed)
+                )
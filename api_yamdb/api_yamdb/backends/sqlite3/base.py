@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        # WAL позволяет читать во время записи, а synchronous=NORMAL
+        # в этом режиме не теряет целостность базы.
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        # BEGIN IMMEDIATE сразу берет блокировку на запись, поэтому
+        # конкурирующие транзакции ждут ее, а не падают с
+        # "database is locked" при попытке повысить блокировку.
+        self.cursor().execute('BEGIN IMMEDIATE')
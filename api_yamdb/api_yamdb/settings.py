@@ -24,9 +24,11 @@ INSTALLED_APPS = [
     'django_filters',
     'api.apps.ApiConfig',
     'reviews.apps.ReviewsConfig',
+    'mailing.apps.MailingConfig',
 ]
 
 MIDDLEWARE = [
+    'api.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,13 +60,64 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
-DATABASES = {
+# DB_ENGINE: 'sqlite' - файл db.sqlite3 (по умолчанию),
+# 'postgresql' - постоянные соединения с проверкой перед использованием,
+# 'postgresql_pool' - пул соединений внутри процесса для потоковых серверов.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'api_yamdb.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+            'OPTIONS': {
+                'timeout': int(os.getenv('DB_TIMEOUT', 20)),
+            },
+            'TEST': {
+                'NAME': os.path.join(BASE_DIR, 'test_db.sqlite3'),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': f'api_yamdb.backends.{DB_ENGINE}',
+            'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': (
+                0 if DB_ENGINE == 'postgresql_pool'
+                else int(os.getenv('DB_CONN_MAX_AGE', 60))
+            ),
+            'CONN_HEALTH_CHECKS': True,
+            'POOL': {
+                'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+                'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+            },
+            'TEST': {
+                'NAME': os.getenv('DB_TEST_NAME', 'test_api_yamdb'),
+            },
+        }
+    }
+
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
     }
 }
 
+CATALOGUE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -108,15 +161,76 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.ApiPagination',
     'PAGE_SIZE': 5,
 }
 
+PAGINATION_MAX_PAGE_SIZE = 100
+
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(weeks=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+QUERY_INSTRUMENTATION = {
+    'N_PLUS_ONE_THRESHOLD': 5,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.queries': {
+            'handlers': ['console'],
+            'level': os.getenv('QUERY_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+TITLES_BULK_BATCH_SIZE = 500
+
+TITLES_EXPORT_CHUNK_SIZE = 1000
+
+# Сколько последних отзывов и комментариев к каждому из них встраивается
+# в ответ /titles/{id}/?include=reviews,comments.
+TITLE_INCLUDE = {
+    'REVIEWS': 5,
+    'COMMENTS': 3,
+}
+
+# Окно популярности сдвигается командой refresh_leaderboards --loop,
+# поэтому отставание таблицы популярных не превышает REFRESH_INTERVAL.
+LEADERBOARDS = {
+    'PAGE_SIZE': 20,
+    'MIN_REVIEWS': 1,
+    'TRENDING_DAYS': 7,
+    'REFRESH_INTERVAL': 300,
+}
+
+AUTH_USER_CACHE = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,
+}
+
 EMAIL_ADMIN = 'admin@yandex.ru'
+
+# DRAIN: 'thread' - отправка в пуле потоков после коммита (dev),
+# 'worker' - только командой send_queued_mail, 'sync' - сразу в запросе.
+MAIL_QUEUE = {
+    'DRAIN': os.getenv('MAIL_QUEUE_DRAIN', 'thread'),
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 60,
+    'LOCK_TIMEOUT': 300,
+    'THREAD_WORKERS': 2,
+}
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import DeadLetterEmail, OutgoingEmail
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipients', 'subject', 'attempts',
+                    'next_attempt_at', 'last_error')
+
+
+class DeadLetterEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipients', 'subject', 'attempts',
+                    'failed_at', 'last_error')
+
+
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
+admin.site.register(DeadLetterEmail, DeadLetterEmailAdmin)
@@ -0,0 +1,40 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from mailing.queue import drain_queue
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Количество писем, отправляемых через одно соединение.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent = drain_queue(options['batch_size'])
+            except Exception:
+                if not options['loop']:
+                    raise
+                logger.exception('Ошибка при отправке очереди писем.')
+                close_old_connections()
+                sent = 0
+            if sent or not options['loop']:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class EmailFields(models.Model):
+    subject = models.CharField('Тема', max_length=255, blank=True)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipients = models.TextField('Получатели')
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f'{self.recipients}: {self.subject}'
+
+    def get_recipients(self):
+        return self.recipients.split(',')
+
+
+class OutgoingEmail(EmailFields):
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now, db_index=True
+    )
+    lock = models.CharField(max_length=32, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+
+
+class DeadLetterEmail(EmailFields):
+    failed_at = models.DateTimeField('Дата отказа', auto_now_add=True)
+
+    class Meta:
+        ordering = ('-failed_at',)
+        verbose_name = 'Неотправленное письмо'
+        verbose_name_plural = 'Неотправленные письма'
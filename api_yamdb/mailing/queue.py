@@ -0,0 +1,152 @@
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import DeadLetterEmail, OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_option(name):
+    return settings.MAIL_QUEUE[name]
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_option('THREAD_WORKERS'),
+            thread_name_prefix='mail-queue'
+        )
+    return _executor
+
+
+def enqueue_mail(subject, body, from_email, recipients):
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        recipients=','.join(recipients)
+    )
+    mode = get_option('DRAIN')
+    if mode == 'sync':
+        transaction.on_commit(drain_queue)
+    elif mode == 'thread':
+        transaction.on_commit(
+            lambda: get_executor().submit(drain_queue_in_thread)
+        )
+    return email
+
+
+def drain_queue_in_thread():
+    close_old_connections()
+    try:
+        drain_queue()
+    except Exception:
+        logger.exception('Ошибка при отправке очереди писем.')
+    finally:
+        close_old_connections()
+
+
+def get_due(now, batch_size):
+    return OutgoingEmail.objects.filter(
+        next_attempt_at__lte=now
+    ).order_by('id').values('id')[:batch_size]
+
+
+def claim_batch(batch_size):
+    now = timezone.now()
+    lock = uuid.uuid4().hex
+    # Срок проверяется повторно в самом UPDATE: если параллельный обработчик
+    # уже продлил аренду тех же писем, они не будут захвачены второй раз.
+    claimed = OutgoingEmail.objects.filter(
+        id__in=get_due(now, batch_size), next_attempt_at__lte=now
+    ).update(
+        lock=lock,
+        next_attempt_at=now + timedelta(seconds=get_option('LOCK_TIMEOUT'))
+    )
+    if not claimed:
+        return []
+    return list(OutgoingEmail.objects.filter(lock=lock))
+
+
+def drain_queue(batch_size=None):
+    batch_size = batch_size or get_option('BATCH_SIZE')
+    sent = 0
+    batch = claim_batch(batch_size)
+    while batch:
+        connection = open_connection(batch)
+        if connection is None:
+            # Сервер недоступен: остальные письма дождутся следующего запуска.
+            break
+        sent += send_batch(connection, batch)
+        batch = claim_batch(batch_size)
+    return sent
+
+
+def open_connection(batch):
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        logger.warning('Не удалось подключиться к почтовому серверу: %r',
+                       error)
+        for email in batch:
+            retry_later(email, error)
+        return None
+    return connection
+
+
+def send_batch(connection, batch):
+    sent = 0
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                email.get_recipients(),
+                connection=connection
+            )
+            try:
+                message.send()
+            except Exception as error:
+                retry_later(email, error)
+            else:
+                email.delete()
+                sent += 1
+    finally:
+        connection.close()
+    return sent
+
+
+def retry_later(email, error):
+    email.attempts += 1
+    email.last_error = repr(error)
+    if email.attempts >= get_option('MAX_ATTEMPTS'):
+        logger.error('Письмо %s перемещено в неотправленные: %s',
+                     email.pk, email.last_error)
+        with transaction.atomic():
+            DeadLetterEmail.objects.create(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                recipients=email.recipients,
+                attempts=email.attempts,
+                last_error=email.last_error
+            )
+            email.delete()
+        return
+    delay = get_option('RETRY_DELAY') * 2 ** (email.attempts - 1)
+    email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    email.lock = ''
+    email.save(update_fields=('attempts', 'last_error',
+                              'next_attempt_at', 'lock'))
@@ -0,0 +1,70 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Review, Title
+
+
+def increment_or_create(model, field, delta, **lookup):
+    rows = model.objects.filter(**lookup)
+    if delta < 0:
+        rows.filter(**{f'{field}__gte': -delta}).update(
+            **{field: F(field) + delta}
+        )
+        return
+    if rows.update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{field: delta})
+    except IntegrityError:
+        rows.update(**{field: F(field) + delta})
+
+
+def update_comments_count(review_id, delta):
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+def comment_created(comment):
+    update_comments_count(comment.review_id, 1)
+
+
+def comment_deleted(comment):
+    update_comments_count(comment.review_id, -1)
+
+
+def get_actual_comments_count():
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    return Coalesce(
+        Subquery(comments.annotate(value=Count('pk')).values('value')), 0
+    )
+
+
+def recalculate_comments_count(queryset=None):
+    if queryset is None:
+        queryset = Review.objects.all()
+    return queryset.update(comments_count=get_actual_comments_count())
+
+
+def drifted_titles():
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return Title.objects.annotate(
+        actual_count=Coalesce(
+            Subquery(reviews.annotate(value=Count('pk')).values('value')), 0
+        ),
+        actual_sum=Coalesce(
+            Subquery(reviews.annotate(value=Sum('score')).values('value')), 0
+        )
+    ).exclude(review_count=F('actual_count'), score_sum=F('actual_sum'))
+
+
+def drifted_reviews():
+    return Review.objects.annotate(
+        actual_count=get_actual_comments_count()
+    ).exclude(comments_count=F('actual_count'))
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery
+from django.utils import timezone
+
+from .counters import increment_or_create
+from .models import Review, Title, TopRatedEntry, TrendingEntry
+
+
+def get_option(name):
+    return settings.LEADERBOARDS[name]
+
+
+def get_trending_since():
+    return timezone.now() - timedelta(days=get_option('TRENDING_DAYS'))
+
+
+def create_top_rated_entries(title_ids):
+    entries = {}
+    rows = Title.objects.filter(pk__in=title_ids).values_list(
+        'pk', 'category_id', 'rating', 'review_count', 'genre'
+    )
+    for title_id, category_id, rating, review_count, genre_id in rows:
+        for genre in {None, genre_id}:
+            entries[title_id, genre] = TopRatedEntry(
+                title_id=title_id, category_id=category_id, genre_id=genre,
+                rating=rating, review_count=review_count
+            )
+    TopRatedEntry.objects.bulk_create(entries.values())
+
+
+def sync_titles(title_ids):
+    TopRatedEntry.objects.filter(title_id__in=title_ids).delete()
+    create_top_rated_entries(title_ids)
+
+
+def rating_changed(title_id):
+    title = Title.objects.filter(pk=OuterRef('title_id'))
+    TopRatedEntry.objects.filter(title_id=title_id).update(
+        rating=Subquery(title.values('rating')),
+        review_count=Subquery(title.values('review_count'))
+    )
+
+
+def review_added(review):
+    increment_or_create(TrendingEntry, 'recent_reviews', 1,
+                        title_id=review.title_id)
+
+
+def review_removed(review):
+    # Отзывы старше окна уже вычтены при обновлении таблицы.
+    if review.pub_date >= get_trending_since():
+        increment_or_create(TrendingEntry, 'recent_reviews', -1,
+                            title_id=review.title_id)
+
+
+def refresh_top_rated(batch_size=1000):
+    TopRatedEntry.objects.all().delete()
+    title_ids = Title.objects.order_by('pk').values_list(
+        'pk', flat=True
+    ).iterator(chunk_size=batch_size)
+    batch = list(islice(title_ids, batch_size))
+    while batch:
+        create_top_rated_entries(batch)
+        batch = list(islice(title_ids, batch_size))
+
+
+def refresh_trending(batch_size=1000, title_ids=None):
+    entries = TrendingEntry.objects.all()
+    reviews = Review.objects.filter(pub_date__gte=get_trending_since())
+    if title_ids is not None:
+        entries = entries.filter(title_id__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    entries.delete()
+    rows = reviews.order_by().values('title').annotate(count=Count('pk'))
+    TrendingEntry.objects.bulk_create(
+        (TrendingEntry(title_id=row['title'], recent_reviews=row['count'])
+         for row in rows.iterator(chunk_size=batch_size)),
+        batch_size=batch_size
+    )
+
+
+def get_top_rated(category=None, genre=None, min_reviews=1):
+    entries = TopRatedEntry.objects.filter(
+        review_count__gte=max(min_reviews, 1)
+    )
+    if genre:
+        entries = entries.filter(genre__slug=genre)
+    else:
+        entries = entries.filter(genre__isnull=True)
+    if category:
+        entries = entries.filter(category__slug=category)
+    return entries.order_by('-rating', 'title_id')
+
+
+def get_trending():
+    return TrendingEntry.objects.filter(
+        recent_reviews__gt=0
+    ).order_by('-recent_reviews', 'title_id')
@@ -0,0 +1,121 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.counters import recalculate_comments_count
+from reviews.leaderboards import refresh_top_rated, refresh_trending
+from reviews.ratings import rebuild_histograms, recalculate_ratings
+from reviews.search import rebuild_index
+
+User = get_user_model()
+
+FILES = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', Title.genre.through),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+
+
+@contextmanager
+def keep_pub_date(model):
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из csv-файлов static/data в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Папка с csv-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.password = make_password(None)
+        for filename, model in FILES:
+            filepath = os.path.join(path, filename)
+            if not os.path.exists(filepath):
+                self.stdout.write(f'{filename}: файл не найден, пропускаем.')
+                continue
+            started = time.monotonic()
+            with transaction.atomic(), keep_pub_date(model):
+                rows = self.load_file(filepath, model, batch_size)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f'{filename}: {rows} строк за {elapsed:.2f} с '
+                f'({rows / elapsed:.0f} строк/с)'
+            )
+        self.reset_sequences()
+        recalculate_ratings()
+        rebuild_histograms()
+        refresh_top_rated()
+        refresh_trending()
+        recalculate_comments_count()
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
+
+    def load_file(self, filepath, model, batch_size):
+        rows = 0
+        batch = []
+        with open(filepath, encoding='utf-8', newline='') as csv_file:
+            reader = csv.DictReader(csv_file)
+            columns = [(name, model._meta.get_field(name))
+                       for name in reader.fieldnames]
+            for row in reader:
+                batch.append(self.build_object(model, columns, row))
+                if len(batch) >= batch_size:
+                    model.objects.bulk_create(batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_create(batch)
+                rows += len(batch)
+        return rows
+
+    def build_object(self, model, columns, row):
+        values = {}
+        for name, field in columns:
+            value = row[name]
+            if value == '' and field.null:
+                value = None
+            values[field.attname] = field.to_python(value)
+        if model is User:
+            values['password'] = self.password
+        return model(**values)
+
+    def reset_sequences(self):
+        models = [model for _, model in FILES]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.ratings import rebuild_histograms
+
+
+class Command(BaseCommand):
+    help = ('Пересобирает распределение оценок всех произведений '
+            'за один проход по отзывам.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        with transaction.atomic():
+            created = rebuild_histograms(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Записано {created} строк распределения оценок.'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.ratings import recalculate_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг и счетчики отзывов всех произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recalculate_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг {updated} произведений.')
+        )
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.leaderboards import refresh_top_rated, refresh_trending
+
+
+class Command(BaseCommand):
+    help = ('Пересобирает таблицы лучших и популярных произведений. '
+            'Отзывы, вышедшие за окно популярности, учитываются только '
+            'этой командой.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одном INSERT.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а обновлять таблицы каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.LEADERBOARDS['REFRESH_INTERVAL']
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            with transaction.atomic():
+                refresh_top_rated(options['batch_size'])
+                refresh_trending(options['batch_size'])
+            self.stdout.write(
+                f'Рейтинги обновлены за {time.monotonic() - started:.2f} с'
+            )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
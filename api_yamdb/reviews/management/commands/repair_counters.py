@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews import leaderboards
+from reviews.counters import (drifted_reviews, drifted_titles,
+                              recalculate_comments_count)
+from reviews.models import Review, Title
+from reviews.ratings import rebuild_histograms, recalculate_ratings
+
+
+class Command(BaseCommand):
+    help = ('Находит и пересчитывает разошедшиеся счетчики отзывов '
+            'и комментариев.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            title_ids = list(drifted_titles().values_list('pk', flat=True))
+            review_ids = list(drifted_reviews().values_list('pk', flat=True))
+            recalculate_ratings(Title.objects.filter(pk__in=title_ids))
+            # Распределение оценок и рейтинги разошлись вместе со счетчиком.
+            rebuild_histograms(title_ids=title_ids)
+            leaderboards.sync_titles(title_ids)
+            leaderboards.refresh_trending(title_ids=title_ids)
+            recalculate_comments_count(
+                Review.objects.filter(pk__in=review_ids)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлены счетчики {len(title_ids)} произведений '
+            f'и {len(review_ids)} отзывов.'
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:34
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    aggregates = Review.objects.order_by().values('title').annotate(
+        review_count=Count('pk'), score_sum=Sum('score'), rating=Avg('score')
+    )
+    for row in aggregates.iterator():
+        Title.objects.filter(pk=row['title']).update(
+            review_count=row['review_count'],
+            score_sum=row['score_sum'],
+            rating=row['rating']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MaxValueValidator(10, message='Оценка не может быть выше 10.'), django.core.validators.MinValueValidator(1, message='Оценка не может быть ниже 1.')]),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+PG_INDEX = 'title_search_vector_idx'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} '
+            'USING fts5(name, description)'
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'SELECT id, name, COALESCE(description, \'\') FROM reviews_title'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {PG_INDEX} ON reviews_title USING gin '
+            '(to_tsvector(\'simple\'::regconfig, COALESCE(name, \'\') '
+            '|| \' \' || COALESCE(description, \'\')))'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX {PG_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
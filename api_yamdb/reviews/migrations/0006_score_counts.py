@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:00
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCount = apps.get_model('reviews', 'ScoreCount')
+    rows = Review.objects.order_by().values('title', 'score').annotate(
+        count=Count('pk')
+    )
+    ScoreCount.objects.bulk_create(
+        [ScoreCount(title_id=row['title'], score=row['score'],
+                    count=row['count']) for row in rows.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_review_comments_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Количество оценок',
+                'verbose_name_plural': 'Распределение оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:03
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_leaderboards(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    TopRatedEntry = apps.get_model('reviews', 'TopRatedEntry')
+    TrendingEntry = apps.get_model('reviews', 'TrendingEntry')
+    genres = {}
+    for title_id, genre_id in Title.genre.through.objects.values_list(
+        'title_id', 'genre_id'
+    ).iterator():
+        genres.setdefault(title_id, []).append(genre_id)
+    TopRatedEntry.objects.bulk_create(
+        [TopRatedEntry(title_id=title_id, category_id=category_id,
+                       genre_id=genre_id, rating=rating,
+                       review_count=review_count)
+         for title_id, category_id, rating, review_count
+         in Title.objects.values_list(
+             'pk', 'category_id', 'rating', 'review_count'
+         ).iterator()
+         for genre_id in [None] + genres.get(title_id, [])],
+        batch_size=1000
+    )
+    since = timezone.now() - timedelta(
+        days=settings.LEADERBOARDS['TRENDING_DAYS']
+    )
+    rows = Review.objects.filter(pub_date__gte=since).order_by().values(
+        'title'
+    ).annotate(count=Count('pk'))
+    TrendingEntry.objects.bulk_create(
+        [TrendingEntry(title_id=row['title'], recent_reviews=row['count'])
+         for row in rows.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_score_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recent_reviews', models.PositiveIntegerField(default=0, verbose_name='Отзывов за период')),
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trending_entry', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Популярное произведение',
+                'verbose_name_plural': 'Популярные произведения',
+            },
+        ),
+        migrations.CreateModel(
+            name='TopRatedEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(blank=True, null=True, verbose_name='Рейтинг')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reviews.Category')),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.Genre')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='top_rated_entries', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Строка рейтинга',
+                'verbose_name_plural': 'Лучшие произведения',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='trendingentry',
+            index=models.Index(fields=['-recent_reviews', 'title'], name='trending_recent_reviews_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topratedentry',
+            index=models.Index(fields=['genre', '-rating', 'title'], name='top_rated_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topratedentry',
+            index=models.Index(fields=['category', 'genre', '-rating', 'title'], name='top_rated_category_idx'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
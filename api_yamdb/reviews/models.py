@@ -36,10 +36,22 @@ class Title(models.Model):
     genre = models.ManyToManyField(Genre)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL,
                                  blank=True, null=True)
+    rating = models.FloatField('Рейтинг', blank=True, null=True,
+                               editable=False)
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0, editable=False
+    )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['year', 'category'],
+                         name='title_year_category_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -63,6 +75,9 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         'Дата добавления', auto_now_add=True, db_index=True
     )
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False
+    )
 
     class Meta:
         ordering = ('pub_date',)
@@ -74,6 +89,10 @@ class Review(models.Model):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(fields=['title', 'pub_date'],
+                         name='review_title_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text[:15]
@@ -95,3 +114,70 @@ class Comment(models.Model):
         ordering = ('pub_date',)
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['review', 'pub_date'],
+                         name='comment_review_pub_date_idx'),
+        ]
+
+
+class ScoreCount(models.Model):
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, related_name='score_counts'
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    class Meta:
+        verbose_name = 'Количество оценок'
+        verbose_name_plural = 'Распределение оценок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='unique_title_score'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
+
+# У каждого произведения одна строка без жанра и по одной на каждый жанр,
+# чтобы рейтинг внутри жанра читался по индексу без соединения таблиц.
+class TopRatedEntry(models.Model):
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, related_name='top_rated_entries'
+    )
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL,
+                                 blank=True, null=True, related_name='+')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE,
+                              blank=True, null=True, related_name='+')
+    rating = models.FloatField('Рейтинг', blank=True, null=True)
+    review_count = models.PositiveIntegerField('Количество отзывов',
+                                               default=0)
+
+    class Meta:
+        verbose_name = 'Строка рейтинга'
+        verbose_name_plural = 'Лучшие произведения'
+        indexes = [
+            models.Index(fields=['genre', '-rating', 'title'],
+                         name='top_rated_genre_idx'),
+            models.Index(fields=['category', 'genre', '-rating', 'title'],
+                         name='top_rated_category_idx'),
+        ]
+
+
+class TrendingEntry(models.Model):
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, related_name='trending_entry'
+    )
+    recent_reviews = models.PositiveIntegerField(
+        'Отзывов за период', default=0
+    )
+
+    class Meta:
+        verbose_name = 'Популярное произведение'
+        verbose_name_plural = 'Популярные произведения'
+        indexes = [
+            models.Index(fields=['-recent_reviews', 'title'],
+                         name='trending_recent_reviews_idx'),
+        ]
@@ -0,0 +1,122 @@
+from django.db.models import (Avg, Case, Count, ExpressionWrapper, F,
+                              FloatField, OuterRef, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Cast, Coalesce
+
+from . import leaderboards
+from .counters import increment_or_create
+from .models import Review, ScoreCount, Title
+
+SCORES = range(1, 11)
+
+
+def update_rating(title_id, score_delta, count_delta):
+    review_count = F('review_count') + count_delta
+    score_sum = F('score_sum') + score_delta
+    Title.objects.filter(pk=title_id).update(
+        review_count=review_count,
+        score_sum=score_sum,
+        rating=Case(
+            When(review_count=-count_delta, then=Value(None)),
+            default=ExpressionWrapper(
+                Cast(score_sum, FloatField()) / review_count,
+                output_field=FloatField()
+            ),
+            output_field=FloatField()
+        )
+    )
+
+
+def update_histogram(title_id, score, delta):
+    increment_or_create(ScoreCount, 'count', delta,
+                        title_id=title_id, score=score)
+
+
+def review_created(review):
+    update_rating(review.title_id, review.score, 1)
+    update_histogram(review.title_id, review.score, 1)
+    leaderboards.rating_changed(review.title_id)
+    leaderboards.review_added(review)
+
+
+def review_updated(review, old_score):
+    if review.score != old_score:
+        update_rating(review.title_id, review.score - old_score, 0)
+        update_histogram(review.title_id, old_score, -1)
+        update_histogram(review.title_id, review.score, 1)
+        leaderboards.rating_changed(review.title_id)
+
+
+def review_deleted(review):
+    update_rating(review.title_id, -review.score, -1)
+    update_histogram(review.title_id, review.score, -1)
+    leaderboards.rating_changed(review.title_id)
+    leaderboards.review_removed(review)
+
+
+def get_histogram(title):
+    histogram = dict.fromkeys(SCORES, 0)
+    histogram.update(title.score_counts.filter(
+        count__gt=0
+    ).values_list('score', 'count'))
+    return histogram
+
+
+def get_score_at(histogram, index):
+    seen = 0
+    for score in sorted(histogram):
+        seen += histogram[score]
+        if seen > index:
+            return score
+
+
+def get_median(histogram):
+    total = sum(histogram.values())
+    if not total:
+        return None
+    lower = get_score_at(histogram, (total - 1) // 2)
+    upper = get_score_at(histogram, total // 2)
+    return (lower + upper) / 2
+
+
+def recalculate_ratings(queryset=None):
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return queryset.update(
+        review_count=Coalesce(
+            Subquery(reviews.annotate(value=Count('pk')).values('value')), 0
+        ),
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(value=Sum('score')).values('value')), 0
+        ),
+        rating=Subquery(
+            reviews.annotate(value=Avg('score')).values('value'),
+            output_field=FloatField()
+        )
+    )
+
+
+def rebuild_histograms(batch_size=1000, title_ids=None):
+    score_counts = ScoreCount.objects.all()
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        score_counts = score_counts.filter(title_id__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    score_counts.delete()
+    rows = reviews.order_by().values('title', 'score').annotate(
+        count=Count('pk')
+    )
+    batch = []
+    created = 0
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(ScoreCount(title_id=row['title'], score=row['score'],
+                                count=row['count']))
+        if len(batch) >= batch_size:
+            ScoreCount.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    ScoreCount.objects.bulk_create(batch)
+    return created + len(batch)
@@ -0,0 +1,80 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+
+
+def get_terms(text):
+    return re.findall(r'\w+', text or '')
+
+
+def index_titles(titles):
+    if connection.vendor != 'sqlite':
+        return
+    rows = [(title.pk, title.name, title.description or '')
+            for title in titles]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(row[0],) for row in rows]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            rows
+        )
+
+
+def unindex_title(pk):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def rebuild_index():
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f'SELECT id, name, COALESCE(description, \'\') '
+            f'FROM {Title._meta.db_table}'
+        )
+
+
+def search_titles(queryset, text):
+    terms = get_terms(text)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'sqlite':
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = {Title._meta.db_table}.id',
+                   f'{FTS_TABLE} MATCH %s'],
+            params=[' '.join(f'"{term}"*' for term in terms)],
+            select={'search_rank': f'{FTS_TABLE}.rank'},
+            order_by=['search_rank', 'id']
+        )
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+
+        vector = SearchVector('name', 'description', config='simple')
+        query = SearchQuery(
+            ' & '.join(f'{term}:*' for term in terms),
+            config='simple',
+            search_type='raw'
+        )
+        return queryset.annotate(
+            search=vector, search_rank=SearchRank(vector, query)
+        ).filter(search=query).order_by('-search_rank', 'id')
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition)
@@ -0,0 +1,39 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters, leaderboards, ratings
+from .models import Comment, Review, Title
+from .search import index_titles, unindex_title
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    index_titles([instance])
+    leaderboards.sync_titles([instance.pk])
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, **kwargs):
+    unindex_title(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def sync_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        leaderboards.sync_titles([instance.pk])
+    elif pk_set:
+        leaderboards.sync_titles(pk_set)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # Отзыв удаляется и каскадом, например вместе с пользователем,
+    # поэтому счетчики обновляются здесь, а не во вьюсете.
+    ratings.review_deleted(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    counters.comment_deleted(instance)
@@ -22,10 +22,14 @@ class Users(AbstractUser):
         default=USER
     )
 
+    def has_role(self, *roles):
+        return (self.role in roles
+                or self.ADMIN in roles and self.is_superuser)
+
     @property
     def is_admin(self):
-        return self.role == self.ADMIN or self.is_superuser
+        return self.has_role(self.ADMIN)
 
     @property
     def is_moderator(self):
-        return self.role == self.MODERATOR
+        return self.has_role(self.MODERATOR)
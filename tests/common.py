@@ -1,8 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
+def begin_queries():
+    # SQLite-бэкенд проекта открывает транзакцию отдельным запросом
+    # BEGIN IMMEDIATE, в PostgreSQL он не попадает в список запросов.
+    return 1 if connection.vendor == 'sqlite' else 0
+
+
 def create_users_api(admin_client):
     data = {
         'username': 'TestUser',
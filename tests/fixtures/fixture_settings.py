@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def mail_queue_sync(settings):
+    settings.MAIL_QUEUE = {**settings.MAIL_QUEUE, 'DRAIN': 'sync'}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
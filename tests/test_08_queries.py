@@ -0,0 +1,72 @@
+import pytest
+
+from .common import create_categories, create_genre
+
+
+def create_many_titles(admin_client, count):
+    from reviews.models import Category, Genre, Title
+
+    create_genre(admin_client)
+    create_categories(admin_client)
+    genres = list(Genre.objects.all())
+    category = Category.objects.first()
+    for i in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000, category=category
+        )
+        title.genre.set(genres)
+
+
+class Test08QueriesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('titles_count', [1, 3, 5, 12])
+    def test_01_titles_list_queries(self, client, admin_client,
+                                    django_assert_num_queries, titles_count):
+        create_many_titles(admin_client, titles_count)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращается статус 200'
+        )
+        assert response.json()['count'] == titles_count, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаете данные с пагинацией. '
+            'Значение параметра `count` не правильное'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client, admin_client,
+                                     django_assert_num_queries):
+        from reviews.models import Title
+
+        create_many_titles(admin_client, 1)
+        title = Title.objects.get()
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` возвращается статус 200'
+        )
+        assert len(response.json()['genre']) == 3, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` возвращаются жанры произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('page_size', [1, 5, 20])
+    def test_03_titles_list_page_size_queries(self, client, admin_client,
+                                              django_assert_num_queries,
+                                              page_size):
+        create_many_titles(admin_client, 12)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/', {'page_size': page_size})
+        assert len(response.json()['results']) == min(page_size, 12), (
+            'Проверьте, что при GET запросе `/api/v1/titles/?page_size=` '
+            'размер страницы задаётся параметром `page_size`'
+        )
+        with django_assert_num_queries(2):
+            response = client.get(
+                '/api/v1/titles/', {'page_size': page_size, 'count': 'false'}
+            )
+        assert 'count' not in response.json(), (
+            'Проверьте, что при GET запросе `/api/v1/titles/?count=false` '
+            'не выполняется подсчёт общего количества записей'
+        )
@@ -0,0 +1,202 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_titles
+
+
+def create_many_reviews(admin_client, django_user_model, count):
+    titles, _, _ = create_titles(admin_client)
+    url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+    for i in range(count):
+        user = django_user_model.objects.create_user(
+            username=f'reviewer{i}', email=f'reviewer{i}@yamdb.fake'
+        )
+        auth_client(user).post(url, data={'text': f'Отзыв {i}', 'score': 5})
+    return url
+
+
+class Test09PaginationAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_page_number_by_default(self, client, admin_client,
+                                               django_user_model):
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        data = client.get(url).json()
+        assert data['count'] == 7 and len(data['results']) == 5, (
+            f'Проверьте, что при GET запросе `{url}` по умолчанию '
+            'используется постраничная пагинация с параметром `count`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_cursor(self, client, admin_client, django_user_model):
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        response = client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` возвращается статус 200'
+        )
+        data = response.json()
+        assert 'count' not in data and data['previous'] is None, (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` '
+            'используется пагинация по курсору'
+        )
+        texts = [review['text'] for review in data['results']]
+        data = client.get(data['next']).json()
+        texts += [review['text'] for review in data['results']]
+        assert data['next'] is None, (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` '
+            'последняя страница не содержит ссылки `next`'
+        )
+        assert texts == [f'Отзыв {i}' for i in range(7)], (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` '
+            'отзывы возвращаются по порядку и без повторов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_page_size(self, client, admin_client,
+                                  django_user_model):
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        data = client.get(url, {'page_size': 3}).json()
+        assert data['count'] == 7 and len(data['results']) == 3, (
+            f'Проверьте, что при GET запросе `{url}?page_size=3` '
+            'возвращается три отзыва'
+        )
+        data = client.get(url, {'page_size': 1000}).json()
+        assert len(data['results']) == 7, (
+            f'Проверьте, что при GET запросе `{url}?page_size=1000` '
+            'возвращаются все отзывы'
+        )
+        data = client.get(url, {'page_size': 3, 'pagination': 'cursor'}).json()
+        assert len(data['results']) == 3, (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` '
+            'учитывается параметр `page_size`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_reviews_limit_offset(self, client, admin_client,
+                                     django_user_model):
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        data = client.get(url, {'limit': 2, 'offset': 4}).json()
+        assert data['count'] == 7, (
+            f'Проверьте, что при GET запросе `{url}?limit=2&offset=4` '
+            'возвращается общее количество отзывов'
+        )
+        assert [review['text'] for review in data['results']] == [
+            'Отзыв 4', 'Отзыв 5'
+        ], (
+            f'Проверьте, что при GET запросе `{url}?limit=2&offset=4` '
+            'возвращаются отзывы со смещением'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_reviews_without_count(self, client, admin_client,
+                                      django_user_model):
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        data = client.get(url, {'count': 'false', 'page_size': 3}).json()
+        assert 'count' not in data and data['previous'] is None, (
+            f'Проверьте, что при GET запросе `{url}?count=false` '
+            'ответ не содержит параметр `count`'
+        )
+        texts = [review['text'] for review in data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            texts += [review['text'] for review in data['results']]
+        assert texts == [f'Отзыв {i}' for i in range(7)], (
+            f'Проверьте, что при GET запросе `{url}?count=false` '
+            'ссылки `next` ведут по всем отзывам без повторов'
+        )
+        data = client.get(
+            url, {'count': 'false', 'limit': 5, 'offset': 5}
+        ).json()
+        assert data['next'] is None and data['previous'] is not None, (
+            f'Проверьте, что при GET запросе `{url}?count=false&limit=5` '
+            'последняя страница содержит только ссылку `previous`'
+        )
+        assert len(data['results']) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_reviews_estimated_count(self, client, admin_client,
+                                        django_user_model, monkeypatch):
+        from api.pagination import CursorOptionalPagination
+        from reviews.models import Title
+
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        data = client.get(url).json()
+        assert data['count'] == 7 and 'count_estimated' not in data, (
+            f'Проверьте, что при GET запросе `{url}` ниже порога '
+            'возвращается точное количество отзывов в обычном формате'
+        )
+        response = client.get(url, {'page': 99})
+        assert response.status_code == 404, (
+            f'Проверьте, что при GET запросе `{url}?page=99` ниже порога '
+            'возвращается статус 404'
+        )
+        monkeypatch.setattr(
+            CursorOptionalPagination, 'estimate_count_above', 3
+        )
+        Title.objects.filter(reviews__isnull=False).update(review_count=40)
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url).json()
+        counts = [query['sql'] for query in context.captured_queries
+                  if 'COUNT(' in query['sql']]
+        assert len(counts) == 1 and 'LIMIT 4' in counts[0], (
+            f'Проверьте, что при GET запросе `{url}` выше порога '
+            'выполняется только ограниченный подсчёт записей'
+        )
+        assert data['count'] == 40 and data['count_estimated'] is True, (
+            f'Проверьте, что при GET запросе `{url}` выше порога '
+            'количество берётся из счётчика отзывов произведения'
+        )
+        assert len(data['results']) == 5 and data['next'] is not None
+        data = client.get(url, {'page': 2}).json()
+        assert len(data['results']) == 2 and data['next'] is None, (
+            f'Проверьте, что при GET запросе `{url}?page=2` с оценкой '
+            'количества ссылки строятся по фактическим данным'
+        )
+        for params in ({'page': 99}, {'page': 99, 'count': 'false'}):
+            response = client.get(url, params)
+            assert response.status_code == 404, (
+                f'Проверьте, что при GET запросе `{url}` с параметрами '
+                f'{params} для пустой страницы возвращается статус 404'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_cursor_with_equal_pub_dates(self, client, admin_client,
+                                            django_user_model):
+        from django.utils import timezone
+
+        from reviews.models import Review
+
+        url = create_many_reviews(admin_client, django_user_model, 7)
+        Review.objects.update(pub_date=timezone.now())
+        pages = []
+        data = client.get(url, {'pagination': 'cursor', 'page_size': 3})
+        data = data.json()
+        with CaptureQueriesContext(connection) as context:
+            while True:
+                pages.append([review['text'] for review in data['results']])
+                if not data['next']:
+                    break
+                data = client.get(data['next']).json()
+        assert pages == [
+            ['Отзыв 0', 'Отзыв 1', 'Отзыв 2'],
+            ['Отзыв 3', 'Отзыв 4', 'Отзыв 5'],
+            ['Отзыв 6']
+        ], (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` '
+            'отзывы с одинаковой датой публикации не повторяются и '
+            'не пропускаются'
+        )
+        assert not any('OFFSET' in query['sql']
+                       for query in context.captured_queries), (
+            f'Проверьте, что при GET запросе `{url}?pagination=cursor` '
+            'страницы выбираются по позиции курсора, а не через OFFSET'
+        )
+        data = client.get(data['previous']).json()
+        assert [review['text'] for review in data['results']] == [
+            'Отзыв 3', 'Отзыв 4', 'Отзыв 5'
+        ]
+        data = client.get(data['previous']).json()
+        assert [review['text'] for review in data['results']] == [
+            'Отзыв 0', 'Отзыв 1', 'Отзыв 2'
+        ] and data['previous'] is None
@@ -0,0 +1,175 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import begin_queries
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class OfflineEmailBackend(BaseEmailBackend):
+
+    def open(self):
+        raise ConnectionRefusedError('SMTP не отвечает')
+
+    def send_messages(self, messages):
+        raise AssertionError('Письма не должны отправляться без соединения')
+
+
+class Test10MailingQueue:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_email(self, client, settings):
+        from mailing.models import OutgoingEmail
+        from mailing.queue import drain_queue
+
+        settings.MAIL_QUEUE = {**settings.MAIL_QUEUE, 'DRAIN': 'worker'}
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200, (
+            f'Проверьте, что при POST запросе `{self.url_signup}` с валидными данными '
+            'возвращается статус 200'
+        )
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что письмо с кодом подтверждения не отправляется в запросе'
+        )
+        assert OutgoingEmail.objects.count() == 1, (
+            'Проверьте, что письмо с кодом подтверждения ставится в очередь'
+        )
+        assert drain_queue() == 1
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert data['email'] in mail.outbox[-1].to
+        assert not OutgoingEmail.objects.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_email_goes_to_dead_letter(self, settings, monkeypatch):
+        from mailing import queue
+        from mailing.models import DeadLetterEmail, OutgoingEmail
+
+        settings.MAIL_QUEUE = {**settings.MAIL_QUEUE, 'DRAIN': 'worker',
+                               'MAX_ATTEMPTS': 2}
+        monkeypatch.setattr(queue, 'get_connection', FailingEmailBackend)
+        queue.enqueue_mail('', 'code', 'admin@yamdb.fake', ['a@yamdb.fake'])
+        assert queue.drain_queue() == 0
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and 'SMTP' in email.last_error, (
+            'Проверьте, что при ошибке отправки письмо остается в очереди для повтора'
+        )
+        assert email.next_attempt_at > timezone.now()
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert queue.drain_queue() == 0
+        assert not OutgoingEmail.objects.exists()
+        assert DeadLetterEmail.objects.get().attempts == 2, (
+            'Проверьте, что после исчерпания попыток письмо попадает в неотправленные'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_signup_queries(self, client, settings,
+                               django_assert_num_queries):
+        settings.MAIL_QUEUE = {**settings.MAIL_QUEUE, 'DRAIN': 'worker'}
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        # поиск пользователя, BEGIN и создание пользователя, письмо в очередь
+        with django_assert_num_queries(3 + begin_queries()):
+            response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_signup_existing_pair_resends_code(self, client, admin_client):
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = admin_client.post('/api/v1/users/', data=data)
+        assert response.status_code == 201
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200, (
+            f'Проверьте, что при POST запросе `{self.url_signup}` с username и email '
+            'существующего пользователя возвращается статус 200'
+        )
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что существующему пользователю повторно отправляется код подтверждения'
+        )
+        response = client.post(
+            self.url_signup, data={'email': data['email'], 'username': 'other'}
+        )
+        assert response.status_code == 400
+        assert response.json() == {
+            'non_field_errors': ['Пользователь с email \'queued@yamdb.fake\' уже существует.']
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_connection_failure_retried(self, settings, monkeypatch):
+        from mailing import queue
+        from mailing.models import DeadLetterEmail, OutgoingEmail
+
+        settings.MAIL_QUEUE = {**settings.MAIL_QUEUE, 'DRAIN': 'worker',
+                               'MAX_ATTEMPTS': 2, 'BATCH_SIZE': 1}
+        monkeypatch.setattr(queue, 'get_connection', OfflineEmailBackend)
+        for recipient in ('a@yamdb.fake', 'b@yamdb.fake'):
+            queue.enqueue_mail('', 'code', 'admin@yamdb.fake', [recipient])
+        assert queue.drain_queue() == 0
+        first, second = OutgoingEmail.objects.order_by('id')
+        assert first.attempts == 1 and 'SMTP' in first.last_error, (
+            'Проверьте, что при недоступности почтового сервера письмо '
+            'откладывается для повторной отправки'
+        )
+        assert not first.lock and first.next_attempt_at > timezone.now()
+        assert second.attempts == 0 and not second.lock, (
+            'Проверьте, что при недоступности почтового сервера '
+            'следующие письма не захватываются'
+        )
+        for _ in range(3):
+            OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+            queue.drain_queue()
+        assert DeadLetterEmail.objects.count() == 2, (
+            'Проверьте, что после исчерпания попыток подключения письма '
+            'попадают в неотправленные'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_worker_loop_survives_errors(self, monkeypatch):
+        from mailing.management.commands import send_queued_mail
+
+        calls = []
+
+        def drain_queue(batch_size):
+            calls.append(batch_size)
+            if len(calls) == 1:
+                raise ConnectionError('SMTP недоступен')
+            return 0
+
+        def sleep(interval):
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+
+        monkeypatch.setattr(send_queued_mail, 'drain_queue', drain_queue)
+        monkeypatch.setattr(send_queued_mail.time, 'sleep', sleep)
+        with pytest.raises(KeyboardInterrupt):
+            call_command('send_queued_mail', '--loop')
+        assert len(calls) == 2, (
+            'Проверьте, что `send_queued_mail --loop` продолжает работу '
+            'после ошибки отправки'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_email_claimed_once(self, settings, monkeypatch):
+        from mailing import queue
+
+        settings.MAIL_QUEUE = {**settings.MAIL_QUEUE, 'DRAIN': 'worker'}
+        queue.enqueue_mail('', 'code', 'admin@yamdb.fake', ['a@yamdb.fake'])
+        # второй обработчик прочитал те же письма до захвата первым
+        stale_due = list(queue.get_due(timezone.now(), 10))
+        assert len(queue.claim_batch(10)) == 1
+        monkeypatch.setattr(queue, 'get_due', lambda now, size: [
+            row['id'] for row in stale_due
+        ])
+        assert queue.claim_batch(10) == [], (
+            'Проверьте, что письмо, уже захваченное другим обработчиком, '
+            'не захватывается повторно'
+        )
@@ -0,0 +1,38 @@
+import pytest
+
+
+class Test11CachedAuthentication:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_loaded_once(self, user_client, django_assert_num_queries):
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает пользователя из БД'
+        )
+        assert response.json()['username'] == 'TestUser'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_change_invalidates_cache(self, admin_client, user_client, user):
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == 200
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == 200, (
+            'Проверьте, что изменение роли пользователя сразу учитывается при проверке прав'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deleted_user_rejected(self, admin_client, user_client, user):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что после удаления пользователя его токен перестает работать'
+        )
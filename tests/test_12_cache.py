@@ -0,0 +1,77 @@
+import pytest
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test12CatalogueCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_cached(self, client, admin_client,
+                            django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'year': 2000})
+        assert response.status_code == 200
+        with django_assert_num_queries(0):
+            cached = client.get('/api/v1/titles/', {'year': 2000})
+        assert cached.json() == response.json(), (
+            'Проверьте, что повторный GET запрос `/api/v1/titles/` отдается из кэша'
+        )
+        assert cached['ETag'] and cached['Last-Modified']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_not_modified(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/genres/')
+        response = client.get(
+            '/api/v1/genres/', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении ETag возвращается статус 304'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_writes_invalidate_cache(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 2
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что после добавления категории кэш списка сбрасывается'
+        )
+
+        url = '/api/v1/titles/'
+        assert client.get(url).json()['results'][0]['rating'] is None
+        user, _ = create_users_api(admin_client)
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert client.get(url).json()['results'][0]['rating'] == 7, (
+            'Проверьте, что после добавления отзыва кэш списка произведений сбрасывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_invalidate_after_commit(self, client, admin_client, admin):
+        from django.db import transaction
+
+        from reviews import ratings
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        assert client.get(url).json()['results'][0]['rating'] is None
+        with transaction.atomic():
+            review = Review.objects.create(
+                title_id=titles[0]['id'], author=admin, text='Отзыв', score=7
+            )
+            # чтение между сохранением отзыва и коммитом
+            response = client.get(url)
+            assert response.json()['results'][0]['rating'] is None
+            ratings.review_created(review)
+        assert client.get(url).json()['results'][0]['rating'] == 7, (
+            'Проверьте, что кэш списка произведений сбрасывается после '
+            'коммита транзакции, а не внутри нее'
+        )
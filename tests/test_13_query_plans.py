@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN есть только в SQLite'
+)
+
+
+def full_scans(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = [row[-1] for row in cursor.fetchall()]
+    # SCAN subquery - обход уже отобранных строк подзапроса, а не таблицы.
+    return [step for step in plan
+            if step.startswith('SCAN') and 'INDEX' not in step
+            and step != 'SCAN subquery']
+
+
+class Test13QueryPlans:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_endpoints_use_indexes(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        urls = [
+            '/api/v1/titles/',
+            '/api/v1/titles/?genre=horror',
+            '/api/v1/titles/?year=2000',
+            '/api/v1/titles/?year=2000&category=films',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/?pagination=cursor',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            '/api/v1/titles/top/',
+            '/api/v1/titles/top/?genre=horror',
+            '/api/v1/titles/top/?category=films&min_reviews=2',
+            '/api/v1/titles/trending/',
+        ]
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            for query in context.captured_queries:
+                sql = query['sql']
+                if ' WHERE ' not in sql:
+                    continue
+                assert not full_scans(sql), (
+                    f'Проверьте, что при GET запросе `{url}` запрос `{sql}` '
+                    'использует индекс, а не полный просмотр таблицы'
+                )
@@ -0,0 +1,45 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test14TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'search': 'поворот'})
+        assert response.status_code == 200
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по названию произведения'
+        )
+        data = client.get('/api/v1/titles/', {'search': 'драма'}).json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id']], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по описанию произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_prefix_and_updates(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = client.get('/api/v1/titles/', {'search': 'прое'}).json()
+        assert data['count'] == 1, (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по началу слова'
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Сериал'}
+        )
+        assert client.get('/api/v1/titles/', {'search': 'прое'}).json()['count'] == 0
+        assert client.get('/api/v1/titles/', {'search': 'сериал'}).json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert client.get('/api/v1/titles/', {'search': 'сериал'}).json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_name_filter_still_works(self, client, admin_client):
+        create_titles(admin_client)
+        data = client.get('/api/v1/titles/', {'name': 'оворот'}).json()
+        assert data['count'] == 1, (
+            'Проверьте, что фильтр `name` по части названия продолжает работать'
+        )
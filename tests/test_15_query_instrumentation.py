@@ -0,0 +1,49 @@
+import json
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+
+class Test15QueryInstrumentation:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing_header(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/', {'year': 1})
+        assert response.status_code == 200
+        assert response['Server-Timing'].startswith('db;dur='), (
+            'Проверьте, что ответ содержит заголовок `Server-Timing`'
+        )
+        assert f'desc="{len(context.captured_queries)} queries"' in response['Server-Timing'], (
+            'Проверьте, что заголовок `Server-Timing` содержит число запросов к БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_log_line(self, client, admin_client, admin, caplog):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with caplog.at_level(logging.INFO, logger='api.queries'):
+            client.get(url)
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == url and record['status'] == 200
+        assert record['queries'] > 0 and record['slowest_query']
+
+    def test_03_duplicates_flagged(self):
+        from api.middleware import QueryStats, fingerprint
+
+        stats = QueryStats()
+        for _ in range(5):
+            stats.record('SELECT * FROM users_users WHERE id = %s', 0.001)
+        stats.record('SELECT * FROM t WHERE id IN (%s, %s)', 0.002)
+        stats.record('SELECT * FROM t WHERE id IN (%s)', 0.001)
+        assert stats.count == 7
+        assert stats.slowest_sql == 'SELECT * FROM t WHERE id IN (%s, %s)'
+        assert stats.get_duplicates() == {
+            'SELECT * FROM users_users WHERE id = %s': 5,
+            fingerprint('SELECT * FROM t WHERE id IN (%s)'): 2,
+        }
+        assert stats.has_n_plus_one(5) and not stats.has_n_plus_one(6)
@@ -0,0 +1,34 @@
+import pytest
+
+from .common import begin_queries, create_comments
+
+
+class Test16NestedRoutes:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_must_belong_to_title(self, client, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        response = client.get(url)
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии к отзыву недоступны по адресу '
+            'чужого произведения и возвращается статус 404'
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 404, (
+            'Проверьте, что нельзя добавить комментарий к отзыву '
+            'по адресу чужого произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_parent_resolved_once(self, admin_client, admin,
+                                     django_assert_num_queries):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        admin_client.get('/api/v1/users/me/')
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        # отзыв, BEGIN, вставка комментария, счетчик комментариев
+        with django_assert_num_queries(3 + begin_queries()):
+            response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+from django.db import connection
+
+from .common import auth_client, create_titles
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor == 'sqlite'
+    and connection.settings_dict['TEST']['NAME'] in (None, ':memory:'),
+    reason='Для проверки нужна файловая тестовая БД'
+)
+
+
+class Test17Concurrency:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_concurrent_duplicate_reviews(self, admin_client, user):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        threads_count = 8
+        barrier = threading.Barrier(threads_count)
+        statuses = []
+
+        def post_review(client):
+            try:
+                barrier.wait()
+                response = client.post(url, data={'text': 'Отзыв', 'score': 7})
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        clients = [auth_client(user) for _ in range(threads_count)]
+        threads = [threading.Thread(target=post_review, args=(client,))
+                   for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == [201] + [400] * (threads_count - 1), (
+            'Проверьте, что при одновременных POST запросах на '
+            '`/api/v1/titles/{title_id}/reviews/` создается только один отзыв, '
+            'а остальные запросы получают статус 400'
+        )
+        assert Review.objects.count() == 1
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.review_count == 1 and title.rating == 7, (
+            'Проверьте, что рейтинг произведения учитывает только созданный отзыв'
+        )
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from .common import create_categories, create_genre
+
+
+class Test18BulkTitles:
+    url = '/api/v1/titles/bulk/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_json(self, admin_client, user_client):
+        from reviews.models import Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        data = [
+            {'name': 'Первое', 'year': 2000, 'genre': ['horror', 'comedy'],
+             'category': 'films', 'description': 'Описание'},
+            {'name': 'Второе', 'year': 3000, 'genre': ['horror'],
+             'category': 'films'},
+            {'name': 'Третье', 'year': 2001, 'genre': ['unknown'],
+             'category': 'books'},
+            {'name': 'Четвертое', 'year': 2002, 'genre': ['drama'],
+             'category': 'books'},
+        ]
+        response = user_client.post(self.url, data=data, format='json')
+        assert response.status_code == 403, (
+            f'Проверьте, что `{self.url}` доступен только администратору'
+        )
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == 201, (
+            f'Проверьте, что при POST запросе `{self.url}` возвращается статус 201'
+        )
+        result = response.json()
+        assert [item['index'] for item in result['created']] == [0, 3]
+        assert [item['index'] for item in result['errors']] == [1, 2], (
+            f'Проверьте, что `{self.url}` возвращает ошибки для каждого '
+            'некорректного произведения, не прерывая загрузку'
+        )
+        assert 'genre' in result['errors'][1]['errors']
+        first = Title.objects.get(pk=result['created'][0]['id'])
+        assert first.name == 'Первое' and first.category.slug == 'films'
+        assert sorted(first.genre.values_list('slug', flat=True)) == ['comedy', 'horror']
+        last = Title.objects.get(pk=result['created'][1]['id'])
+        assert list(last.genre.values_list('slug', flat=True)) == ['drama']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_ndjson(self, admin_client, client,
+                            django_assert_max_num_queries):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        lines = [
+            json.dumps({'name': f'Произведение {i}', 'year': 2000,
+                        'genre': ['drama'], 'category': 'books'})
+            for i in range(30)
+        ]
+        lines.insert(5, '{not json')
+        with django_assert_max_num_queries(10):
+            response = admin_client.post(
+                self.url, data='\n'.join(lines),
+                content_type='application/x-ndjson'
+            )
+        assert response.status_code == 201
+        result = response.json()
+        assert len(result['created']) == 30
+        assert [item['index'] for item in result['errors']] == [5]
+        data = client.get('/api/v1/titles/', {'search': 'произведение'}).json()
+        assert data['count'] == 30, (
+            'Проверьте, что загруженные произведения попадают в поиск и кэш сбрасывается'
+        )
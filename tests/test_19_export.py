@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+
+import pytest
+
+from .common import create_reviews
+
+
+class Test19TitlesExport:
+    url = '/api/v1/titles/export/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_permissions(self, client, user_client):
+        assert client.get(self.url).status_code == 401
+        assert user_client.get(self.url).status_code == 403, (
+            f'Проверьте, что `{self.url}` доступен только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_ndjson(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        assert response.streaming, (
+            f'Проверьте, что `{self.url}` отдает данные потоком'
+        )
+        rows = [json.loads(line) for line in
+                b''.join(response.streaming_content).decode().splitlines()]
+        assert [row['id'] for row in rows] == [title['id'] for title in titles]
+        assert rows[0]['genre'] == sorted(titles[0]['genre'])
+        assert rows[0]['category'] == titles[0]['category']
+        assert rows[0]['rating'] == 4 and rows[0]['review_count'] == 3
+        assert rows[1]['rating'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_csv(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get(self.url, {'output': 'csv'})
+        assert response.status_code == 200
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 2
+        assert rows[0]['genre'] == ','.join(sorted(titles[0]['genre']))
+        assert admin_client.get(self.url, {'output': 'xml'}).status_code == 400
@@ -0,0 +1,116 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments, create_reviews
+
+
+class Test20Counters:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_counters_in_responses(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        assert client.get(title_url).json()['reviews_count'] == 3, (
+            f'Проверьте, что при GET запросе `{title_url}` '
+            'возвращается поле `reviews_count`'
+        )
+        assert client.get(review_url).json()['comments_count'] == 3, (
+            f'Проверьте, что при GET запросе `{review_url}` '
+            'возвращается поле `comments_count`'
+        )
+        response = admin_client.delete(
+            f'{review_url}comments/{comments[0]["id"]}/'
+        )
+        assert response.status_code == 204
+        assert client.get(review_url).json()['comments_count'] == 2, (
+            'Проверьте, что при удалении комментария '
+            'уменьшается `comments_count` отзыва'
+        )
+        admin_client.delete(review_url)
+        assert client.get(title_url).json()['reviews_count'] == 2, (
+            'Проверьте, что при удалении отзыва '
+            'уменьшается `reviews_count` произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_repair_counters(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        Title.objects.filter(pk=titles[0]['id']).update(review_count=10)
+        Review.objects.filter(pk=reviews[0]['id']).update(comments_count=0)
+        Review.objects.filter(pk=reviews[1]['id']).update(comments_count=5)
+        out = StringIO()
+        call_command('repair_counters', stdout=out)
+        assert '1 произведений и 2 отзывов' in out.getvalue(), (
+            'Проверьте, что команда repair_counters исправляет '
+            'только разошедшиеся счетчики'
+        )
+        assert Title.objects.get(pk=titles[0]['id']).review_count == 3
+        assert list(Review.objects.order_by('pk').values_list(
+            'comments_count', flat=True
+        )) == [3, 0, 0]
+        out = StringIO()
+        call_command('repair_counters', stdout=out)
+        assert '0 произведений и 0 отзывов' in out.getvalue()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_user_delete_updates_rating(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        data = client.get(title_url).json()
+        assert data['reviews_count'] == 2 and data['rating'] == 4, (
+            'Проверьте, что при удалении пользователя рейтинг и `reviews_count` '
+            'произведения пересчитываются без его отзывов'
+        )
+        admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        admin_client.delete(
+            f'{title_url}reviews/{reviews[0]["id"]}/'
+        )
+        data = client.get(title_url).json()
+        assert data['reviews_count'] == 0 and data['rating'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_user_delete_updates_comments_count(self, client,
+                                                   admin_client, admin):
+        _, reviews, titles, user, _ = create_comments(admin_client, admin)
+        review_url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                      f'{reviews[0]["id"]}/')
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert client.get(review_url).json()['comments_count'] == 2, (
+            'Проверьте, что при удалении пользователя уменьшается '
+            '`comments_count` отзывов, которые он комментировал'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_repair_counters_rebuilds_stats(self, client, admin_client,
+                                               admin):
+        from reviews.models import Review, TrendingEntry
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        Review.objects.filter(pk=reviews[1]['id']).update(score=10)
+        TrendingEntry.objects.filter(title_id=title_id).update(
+            recent_reviews=7
+        )
+        call_command('repair_counters', stdout=StringIO())
+        data = client.get(f'/api/v1/titles/{title_id}/stats/').json()
+        assert data['histogram']['3'] == 0 and data['histogram']['10'] == 1, (
+            'Проверьте, что команда repair_counters пересобирает '
+            'распределение оценок произведения'
+        )
+        assert data['median'] == 5
+        top = client.get('/api/v1/titles/top/').json()['results']
+        assert top[0]['rating'] == 6, (
+            'Проверьте, что команда repair_counters обновляет рейтинг '
+            'в лучших произведениях'
+        )
+        trending = client.get('/api/v1/titles/trending/').json()['results']
+        assert trending[0]['recent_reviews'] == 3, (
+            'Проверьте, что команда repair_counters пересчитывает '
+            'количество новых отзывов'
+        )
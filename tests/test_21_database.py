@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+
+class Test21Database:
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite',
+                        reason='Режим журнала проверяется только в SQLite')
+    @pytest.mark.django_db(transaction=True)
+    def test_01_sqlite_wal_and_busy_timeout(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        assert journal_mode == 'wal', (
+            'Проверьте, что SQLite работает в режиме WAL'
+        )
+        assert busy_timeout > 0, (
+            'Проверьте, что для SQLite задано время ожидания блокировки'
+        )
+
+    @pytest.mark.skipif(settings.DB_ENGINE != 'postgresql',
+                        reason='Проверка соединений включается при '
+                               'DB_ENGINE=postgresql')
+    @pytest.mark.django_db(transaction=True)
+    def test_02_postgresql_broken_connection_is_replaced(self):
+        connection.ensure_connection()
+        connection.connection.close()
+        # так Django начинает каждый запрос
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            assert cursor.fetchone() == (1,), (
+                'Проверьте, что соединение, закрытое сервером, '
+                'заменяется новым в начале запроса'
+            )
+
+    @pytest.mark.skipif(settings.DB_ENGINE != 'postgresql',
+                        reason='Проверка соединений включается при '
+                               'DB_ENGINE=postgresql')
+    @pytest.mark.django_db(transaction=True)
+    def test_03_postgresql_live_connection_is_kept(self):
+        connection.ensure_connection()
+        raw_connection = connection.connection
+        connection.close_if_unusable_or_obsolete()
+        assert not connection.health_check_done
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        assert connection.connection is raw_connection, (
+            'Проверьте, что рабочее постоянное соединение не переоткрывается'
+        )
+        assert connection.health_check_done, (
+            'Проверьте, что соединение проверяется один раз за запрос'
+        )
+
+    @pytest.mark.skipif(settings.DB_ENGINE != 'postgresql_pool',
+                        reason='Пул включается при DB_ENGINE=postgresql_pool')
+    @pytest.mark.django_db(transaction=True)
+    def test_04_pool_reuses_connections(self):
+        connection.ensure_connection()
+        raw_connection = connection.connection
+        connection.close()
+        assert id(raw_connection) not in connection.pool._rused, (
+            'Проверьте, что при закрытии соединение возвращается в пул'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            assert cursor.fetchone() == (1,)
+
+    @pytest.mark.skipif(settings.DB_ENGINE != 'postgresql_pool',
+                        reason='Пул включается при DB_ENGINE=postgresql_pool')
+    @pytest.mark.django_db(transaction=True)
+    def test_05_pool_waits_for_free_connection(self):
+        from psycopg2.pool import PoolError
+
+        from api_yamdb.backends.postgresql_pool.base import (
+            BlockingConnectionPool
+        )
+
+        pool = BlockingConnectionPool(
+            0, 1, 0.5, **connection.get_connection_params()
+        )
+        try:
+            busy = pool.getconn()
+            received = []
+            waiter = threading.Thread(
+                target=lambda: received.append(pool.getconn())
+            )
+            waiter.start()
+            time.sleep(0.1)
+            pool.putconn(busy)
+            waiter.join()
+            assert len(received) == 1, (
+                'Проверьте, что при нехватке соединений поток ждет, '
+                'пока соединение не вернут в пул'
+            )
+            with pytest.raises(PoolError):
+                pool.getconn()
+            pool.putconn(received[0])
+        finally:
+            pool.closeall()
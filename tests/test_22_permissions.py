@@ -0,0 +1,93 @@
+import pytest
+
+from .common import auth_client, begin_queries, create_comments
+
+
+class Test22Permissions:
+
+    def get_urls(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        review_url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                      f'{reviews[1]["id"]}/')
+        comment_url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                       f'{reviews[0]["id"]}/comments/{comments[1]["id"]}/')
+        user_client = auth_client(user)
+        user_client.get('/api/v1/users/me/')
+        return review_url, comment_url, user_client
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_queries(self, client, admin_client, admin,
+                               django_assert_num_queries):
+        review_url, _, user_client = self.get_urls(admin_client, admin)
+        # произведение, отзыв с автором
+        with django_assert_num_queries(2):
+            response = client.get(review_url)
+        assert response.status_code == 200
+        # произведение, отзыв с автором, изменение отзыва
+        with django_assert_num_queries(3 + begin_queries()):
+            response = user_client.patch(review_url, data={'text': 'Новый'},
+                                         format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что при PATCH запросе `{review_url}` автор '
+            'может изменить свой отзыв'
+        )
+        # произведение, отзыв с автором, удаление комментариев и отзыва,
+        # рейтинг, распределение оценок, лучшие и популярные произведения
+        with django_assert_num_queries(8 + begin_queries()):
+            response = user_client.delete(review_url)
+        assert response.status_code == 204, (
+            f'Проверьте, что при DELETE запросе `{review_url}` автор '
+            'может удалить свой отзыв'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_queries(self, client, admin_client, admin,
+                                django_assert_num_queries):
+        _, comment_url, user_client = self.get_urls(admin_client, admin)
+        # отзыв, комментарий с автором
+        with django_assert_num_queries(2):
+            response = client.get(comment_url)
+        assert response.status_code == 200
+        # отзыв, комментарий с автором, изменение комментария
+        with django_assert_num_queries(3):
+            response = user_client.patch(comment_url, data={'text': 'Новый'},
+                                         format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что при PATCH запросе `{comment_url}` автор '
+            'может изменить свой комментарий'
+        )
+        # отзыв, комментарий с автором, удаление, счетчик комментариев
+        with django_assert_num_queries(4 + begin_queries()):
+            response = user_client.delete(comment_url)
+        assert response.status_code == 204, (
+            f'Проверьте, что при DELETE запросе `{comment_url}` автор '
+            'может удалить свой комментарий'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_foreign_objects(self, admin_client, admin,
+                                django_user_model):
+        review_url, comment_url, _ = self.get_urls(admin_client, admin)
+        other = django_user_model.objects.create_user(
+            username='other', email='other@yamdb.fake'
+        )
+        for url in (review_url, comment_url):
+            response = auth_client(other).patch(
+                url, data={'text': 'Чужой'}, format='json'
+            )
+            assert response.status_code == 403, (
+                f'Проверьте, что при PATCH запросе `{url}` пользователь '
+                'не может изменить чужой объект'
+            )
+
+    def test_04_has_role(self, django_user_model):
+        user = django_user_model(role=django_user_model.MODERATOR)
+        assert user.has_role(user.MODERATOR, user.ADMIN)
+        assert not user.has_role(user.ADMIN)
+        superuser = django_user_model(is_superuser=True)
+        assert superuser.has_role(superuser.ADMIN) and superuser.is_admin, (
+            'Проверьте, что суперпользователь считается администратором'
+        )
+        assert not superuser.is_moderator
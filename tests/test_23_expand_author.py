@@ -0,0 +1,60 @@
+import pytest
+
+from .common import auth_client, create_titles
+
+
+def create_many_comments(admin_client, django_user_model, count):
+    titles, _, _ = create_titles(admin_client)
+    reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+    review_id = admin_client.post(
+        reviews_url, data={'text': 'Отзыв', 'score': 5}
+    ).json()['id']
+    comments_url = f'{reviews_url}{review_id}/comments/'
+    for i in range(count):
+        user = django_user_model.objects.create_user(
+            username=f'author{i}', email=f'author{i}@yamdb.fake'
+        )
+        client = auth_client(user)
+        client.post(reviews_url, data={'text': f'Отзыв {i}', 'score': 5})
+        client.post(comments_url, data={'text': f'Комментарий {i}'})
+    return reviews_url, comments_url
+
+
+class Test23ExpandAuthor:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('count', [1, 4])
+    def test_01_lists_without_author_queries(self, client, admin_client,
+                                             django_user_model,
+                                             django_assert_num_queries,
+                                             count):
+        urls = create_many_comments(admin_client, django_user_model, count)
+        for url in urls:
+            # родительский объект, подсчет, страница с авторами
+            with django_assert_num_queries(3):
+                response = client.get(url)
+            assert response.status_code == 200
+            assert all(isinstance(item['author'], str)
+                       for item in response.json()['results']), (
+                f'Проверьте, что при GET запросе `{url}` поле `author` '
+                'содержит username автора'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_expand_author(self, client, admin_client, django_user_model,
+                              django_assert_num_queries):
+        urls = create_many_comments(admin_client, django_user_model, 4)
+        for url in urls:
+            with django_assert_num_queries(3):
+                response = client.get(url, {'expand': 'author'})
+            results = response.json()['results']
+            assert results[-1]['author'] == {
+                'username': 'author3', 'role': 'user'
+            }, (
+                f'Проверьте, что при GET запросе `{url}?expand=author` '
+                'поле `author` содержит username и роль автора'
+            )
+            detail = client.get(
+                f'{url}{results[0]["id"]}/', {'expand': 'author'}
+            ).json()
+            assert detail['author'] == results[0]['author']
@@ -0,0 +1,68 @@
+import pytest
+
+from .common import auth_client, create_titles
+
+
+def create_title_with_reviews(admin_client, django_user_model,
+                              reviews_count, comments_count):
+    titles, _, _ = create_titles(admin_client)
+    url = f'/api/v1/titles/{titles[0]["id"]}/'
+    for i in range(reviews_count):
+        user = django_user_model.objects.create_user(
+            username=f'reviewer{i}', email=f'reviewer{i}@yamdb.fake'
+        )
+        review_id = auth_client(user).post(
+            f'{url}reviews/', data={'text': f'Отзыв {i}', 'score': 5}
+        ).json()['id']
+        for j in range(comments_count):
+            admin_client.post(f'{url}reviews/{review_id}/comments/',
+                              data={'text': f'Комментарий {i}.{j}'})
+    return url
+
+
+class Test24TitleInclude:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('reviews_count,comments_count', [(1, 1), (7, 5)])
+    def test_01_include_query_budget(self, client, admin_client,
+                                     django_user_model,
+                                     django_assert_num_queries,
+                                     reviews_count, comments_count):
+        url = create_title_with_reviews(
+            admin_client, django_user_model, reviews_count, comments_count
+        )
+        # произведение, жанры, отзывы с авторами, комментарии с авторами
+        with django_assert_num_queries(4):
+            response = client.get(url, {'include': 'reviews,comments'})
+        assert response.status_code == 200
+        reviews = response.json()['reviews']
+        assert [review['text'] for review in reviews] == [
+            f'Отзыв {i}' for i in reversed(range(reviews_count))
+        ][:5], (
+            f'Проверьте, что при GET запросе `{url}?include=reviews` '
+            'встраиваются последние отзывы, новые первыми'
+        )
+        assert [comment['text'] for comment in reviews[0]['comments']] == [
+            f'Комментарий {reviews_count - 1}.{j}'
+            for j in reversed(range(comments_count))
+        ][:3], (
+            f'Проверьте, что при GET запросе `{url}?include=comments` '
+            'в каждый отзыв встраиваются его последние комментарии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_include_reviews_only(self, client, admin_client,
+                                     django_user_model,
+                                     django_assert_num_queries):
+        url = create_title_with_reviews(admin_client, django_user_model, 2, 2)
+        with django_assert_num_queries(3):
+            data = client.get(url, {'include': 'reviews'}).json()
+        assert len(data['reviews']) == 2
+        assert 'comments' not in data['reviews'][0], (
+            f'Проверьте, что при GET запросе `{url}?include=reviews` '
+            'комментарии не встраиваются'
+        )
+        assert 'reviews' not in client.get(url).json(), (
+            f'Проверьте, что при GET запросе `{url}` без `include` '
+            'отзывы не встраиваются'
+        )
@@ -0,0 +1,79 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test25TitleStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats(self, client, admin_client, admin,
+                      django_assert_num_queries):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        # произведение, распределение оценок
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        data = response.json()
+        assert data['reviews_count'] == 3 and data['median'] == 4, (
+            f'Проверьте, что при GET запросе `{url}` возвращаются '
+            'количество отзывов и медиана оценок'
+        )
+        assert data['histogram'] == {
+            str(score): int(score in (3, 4, 5)) for score in range(1, 11)
+        }, (
+            f'Проверьте, что при GET запросе `{url}` возвращается '
+            'распределение оценок от 1 до 10'
+        )
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        auth_client(user).patch(f'{review_url}{reviews[1]["id"]}/',
+                                data={'score': 10}, format='json')
+        admin_client.delete(f'{review_url}{reviews[0]["id"]}/')
+        data = client.get(url).json()
+        assert data['histogram']['3'] == 0 and data['histogram']['5'] == 0
+        assert data['histogram']['10'] == 1 and data['histogram']['4'] == 1
+        assert data['reviews_count'] == 2 and data['median'] == 7, (
+            'Проверьте, что распределение оценок обновляется при '
+            'изменении и удалении отзывов'
+        )
+        response = client.get('/api/v1/titles/0/stats/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_histograms(self, client, admin_client, admin):
+        from reviews.models import ScoreCount
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        expected = client.get(url).json()
+        ScoreCount.objects.all().delete()
+        assert client.get(url).json()['median'] is None
+        out = StringIO()
+        call_command('rebuild_score_histograms', '--batch-size', '2',
+                     stdout=out)
+        assert 'Записано 3 строк' in out.getvalue()
+        assert client.get(url).json() == expected, (
+            'Проверьте, что команда rebuild_score_histograms '
+            'восстанавливает распределение оценок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_user_delete_updates_histogram(self, client, admin_client,
+                                              admin):
+        _, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        for username in (user.username, moderator.username):
+            admin_client.delete(f'/api/v1/users/{username}/')
+        data = client.get(url).json()
+        assert data['reviews_count'] == 1 and data['median'] == 5, (
+            'Проверьте, что при удалении пользователя его оценки '
+            'убираются из распределения'
+        )
+        assert data['histogram'] == {
+            str(score): int(score == 5) for score in range(1, 11)
+        }
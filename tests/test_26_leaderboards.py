@@ -0,0 +1,124 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import create_reviews
+
+
+def create_rated_titles(admin_client, admin):
+    reviews, titles, user, _ = create_reviews(admin_client, admin)
+    admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                      data={'text': 'Отлично', 'score': 9})
+    return reviews, titles
+
+
+def names(response):
+    return [title['name'] for title in response.json()['results']]
+
+
+class Test26Leaderboards:
+    url_top = '/api/v1/titles/top/'
+    url_trending = '/api/v1/titles/trending/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top_rated(self, client, admin_client, admin,
+                          django_assert_num_queries):
+        create_rated_titles(admin_client, admin)
+        # строки рейтинга с произведениями и категориями, жанры
+        with django_assert_num_queries(2):
+            response = client.get(self.url_top)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{self.url_top}` '
+            'возвращается статус 200'
+        )
+        assert names(response) == ['Проект', 'Поворот туда'], (
+            f'Проверьте, что при GET запросе `{self.url_top}` произведения '
+            'упорядочены по рейтингу'
+        )
+        assert 'count' not in response.json()
+        assert names(client.get(self.url_top, {'min_reviews': 2})) == [
+            'Поворот туда'
+        ], (
+            f'Проверьте, что при GET запросе `{self.url_top}?min_reviews=` '
+            'учитывается минимальное количество отзывов'
+        )
+        assert names(client.get(self.url_top, {'genre': 'horror'})) == [
+            'Поворот туда'
+        ], (
+            f'Проверьте, что при GET запросе `{self.url_top}?genre=` '
+            'возвращаются произведения жанра'
+        )
+        assert names(client.get(self.url_top, {'category': 'books'})) == [
+            'Проект'
+        ], (
+            f'Проверьте, что при GET запросе `{self.url_top}?category=` '
+            'возвращаются произведения категории'
+        )
+        response = client.get(self.url_top, {'min_reviews': 'много'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_top_rated_follows_title_changes(self, client, admin_client,
+                                                admin):
+        _, titles = create_rated_titles(admin_client, admin)
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/',
+                           data={'genre': ['horror']}, format='json')
+        assert names(client.get(self.url_top, {'genre': 'horror'})) == [
+            'Проект', 'Поворот туда'
+        ], (
+            'Проверьте, что рейтинг внутри жанра обновляется '
+            'при изменении жанров произведения'
+        )
+        assert names(client.get(self.url_top, {'genre': 'drama'})) == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_trending(self, client, admin_client, admin):
+        from reviews.models import Review
+
+        reviews, titles = create_rated_titles(admin_client, admin)
+        data = client.get(self.url_trending).json()['results']
+        assert [(title['name'], title['recent_reviews']) for title in data] == [
+            ('Поворот туда', 3), ('Проект', 1)
+        ], (
+            f'Проверьте, что при GET запросе `{self.url_trending}` '
+            'произведения упорядочены по количеству новых отзывов'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                            f'{reviews[0]["id"]}/')
+        data = client.get(self.url_trending).json()['results']
+        assert data[0]['recent_reviews'] == 2, (
+            'Проверьте, что удаление отзыва уменьшает количество новых отзывов'
+        )
+        Review.objects.filter(title_id=titles[0]['id']).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        call_command('refresh_leaderboards', stdout=StringIO())
+        assert names(client.get(self.url_trending)) == ['Проект'], (
+            'Проверьте, что команда refresh_leaderboards убирает отзывы, '
+            'вышедшие за окно популярности'
+        )
+        assert names(client.get(self.url_top)) == ['Проект', 'Поворот туда']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_user_delete_updates_leaderboards(self, client, admin_client,
+                                                 admin):
+        reviews, _ = create_rated_titles(admin_client, admin)
+        admin_client.delete(f'/api/v1/users/{reviews[1]["author"]}/')
+        admin.delete()
+        data = client.get(self.url_trending).json()['results']
+        assert [(title['name'], title['recent_reviews']) for title in data] == [
+            ('Поворот туда', 1)
+        ], (
+            'Проверьте, что при удалении пользователя его отзывы '
+            'не учитываются в популярных произведениях'
+        )
+        data = client.get(self.url_top).json()['results']
+        assert [(title['name'], title['rating']) for title in data] == [
+            ('Поворот туда', 4)
+        ], (
+            'Проверьте, что при удалении пользователя рейтинг произведения '
+            'в лучших произведениях пересчитывается'
+        )